@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Compares the number of bytes in rendered rows with the number of bytes
+needed when every colored cell gets its own escape sequence and reset,
+and when every line of text boxes and lines is colored and reset.
+"""
+from __future__ import unicode_literals
+
+import numpy as np
+
+from termplotlib.colors import fg, bg, st
+from termplotlib.raster import RasterCanvas
+from termplotlib.text import TextBox
+from termplotlib.lines import HorizontalLine, VerticalArrow
+from termplotlib.screen import split_cells, _SGR
+
+
+def per_cell_rows(canvas):
+    """Render a RasterCanvas with one escape sequence and reset per colored cell."""
+    c_width, c_height = canvas._c_width, canvas._c_height
+    padding = np.zeros((2, 2), dtype=int)
+    codes, colors = canvas._get_cells(padding, c_width, np.arange(c_height))
+    rows = []
+    for y in reversed(range(c_height)):
+        row = canvas.background
+        for code, color in zip(codes[y], colors[y]):
+            if code == 0:
+                row += ' '
+            else:
+                row += canvas._palette[color] + canvas._glyphs[code] + fg.RESET
+        rows.append(row + bg.RESET)
+    return rows
+
+
+def per_line_line_rows(line, width, height):
+    """Render a Line with its colors set at the start of every line and reset at the end."""
+    return [line._fg + line._bg + _SGR.sub('', row) + st.RESET_ALL for row in line.get_rows(width, height)]
+
+
+def per_line_box_rows(box, width, height):
+    """Render a TextBox like per_line_line_rows, switching to the text color and back on lines of text."""
+    text = [_SGR.sub('', row) for row in box.get_rows(width, height)]
+    pad_below = max(np.floor(box.get_padding(width, height)[0,1] / 4.0).astype(int), 0)
+    first_line = len(text) - 1 - pad_below - len(box._lines)
+    rows = []
+    for i, row in enumerate(text):
+        if first_line <= i < first_line + len(box._lines):
+            row = row[0] + box._fg + row[1:-1] + box._b_fg + row[-1]
+        rows.append(box._b_fg + box._bg + row + st.RESET_ALL)
+    return rows
+
+
+def visible(rows):
+    """Return the characters of rows with their colors, ignoring the foreground of spaces."""
+    return [[(s if c != ' ' else (s[0], None, s[2]), c) for s, c in split_cells(row)]
+            for row in rows]
+
+
+def n_bytes(rows):
+    return len('\n'.join(rows).encode('utf-8'))
+
+
+def sine(width, height, colors, background=None):
+    c = RasterCanvas(width, height, background=background)
+    x = np.arange(width)
+    for i, color in enumerate(colors):
+        y = (height / 2.0 - 1) * (1 + np.sin(x * (i + 1) * 4 * np.pi / width))
+        c.set(x, y.astype(int), color=color)
+    return c
+
+
+def scatter(width, height, colors, n):
+    c = RasterCanvas(width, height)
+    rng = np.random.RandomState(0)
+    for color in colors:
+        c.set(rng.randint(0, width, n), rng.randint(0, height, n), color=color)
+    return c
+
+
+if __name__ == '__main__':
+    cases = [('sine, monochrome', sine(400, 200, ['blue'])),
+             ('sine, 3 colors', sine(400, 200, ['blue', 'red', 'orange'], background='navy')),
+             ('scatter, monochrome', scatter(400, 200, ['green'], 20000)),
+             ('scatter, 2 colors', scatter(400, 200, ['green', 'pink'], 10000))]
+
+    print '{:<24}{:>12}{:>12}{:>8}'.format('case', 'per cell', 'coalesced', 'ratio')
+    for name, canvas in cases:
+        rows = canvas.get_rows()
+        reference = per_cell_rows(canvas)
+        assert visible(rows) == visible(reference)
+        print '{:<24}{:>12}{:>12}{:>8.2f}'.format(name, n_bytes(reference), n_bytes(rows),
+                                                  n_bytes(reference) / float(n_bytes(rows)))
+
+    text = 'Status\nAll systems nominal'
+    lines = [('text box, no colors', TextBox(text=text), per_line_box_rows),
+             ('text box, 1 color', TextBox(text=text, color='orange', border_color='orange'), per_line_box_rows),
+             ('text box, 2 colors', TextBox(text=text, color='red', background='navy', border_color='orange'),
+              per_line_box_rows),
+             ('horizontal line', HorizontalLine(), per_line_line_rows),
+             ('horizontal line, colored', HorizontalLine(color='orange', background='navy'), per_line_line_rows),
+             ('vertical arrow', VerticalArrow(color='orange'), per_line_line_rows)]
+    print
+    print '{:<24}{:>12}{:>12}{:>8}'.format('case', 'per line', 'coalesced', 'ratio')
+    for name, canvas, reference_rows in lines:
+        rows = canvas.get_rows(80, 40)
+        reference = reference_rows(canvas, 80, 40)
+        assert visible(rows) == visible(reference)
+        print '{:<24}{:>12}{:>12}{:>8.2f}'.format(name, n_bytes(reference), n_bytes(rows),
+                                                  n_bytes(reference) / float(n_bytes(rows)))
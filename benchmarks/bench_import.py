@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+"""
+Times importing termplotlib modules, on top of the time it takes to import
+NumPy. Every import is timed in a new interpreter, after a first import
+that writes the bytecode files, and the median of all runs is shown.
+
+Usage: bench_import.py [number of runs] [module ...]
+"""
+from __future__ import unicode_literals
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+_timer = '''
+import time
+start = time.time()
+import numpy
+numpy_done = time.time()
+import {}
+print numpy_done - start, time.time() - numpy_done
+'''
+
+
+def import_times(module, runs):
+    """Return the times to import NumPy and to import module after it, in every run."""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    command = [sys.executable, '-c', _timer.format(module)]
+    subprocess.check_output(command, env=env)
+    times = [subprocess.check_output(command, env=env).split() for i in range(runs)]
+    return np.array(times, dtype=float)
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    modules = sys.argv[2:] or ['termplotlib.raster', 'termplotlib.density', 'termplotlib.layout',
+                               'termplotlib.letters']
+
+    print '{} runs, median times'.format(runs)
+    print '{:<24}{:>12}{:>14}'.format('module', 'numpy [ms]', 'module [ms]')
+    for module in modules:
+        times = np.median(import_times(module, runs), axis=0) * 1000
+        print '{:<24}{:>12.2f}{:>14.2f}'.format(module, times[0], times[1])
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""
+Times rasterizing a large number of points with RasterCanvas.set and
+DensityCanvas.set for an increasing number of worker threads.
+
+Usage: bench_parallel.py [number of points] [highest number of workers]
+"""
+from __future__ import unicode_literals
+
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+
+from termplotlib.raster import RasterCanvas
+from termplotlib.density import DensityCanvas
+
+
+def best_time(canvas_class, x, y, workers, repeat=3):
+    times = []
+    for i in range(repeat):
+        canvas = canvas_class(2000, 1000)
+        canvas.workers = workers
+        start = time.time()
+        canvas.set(x, y)
+        times.append(time.time() - start)
+    return min(times)
+
+
+if __name__ == '__main__':
+    n_points = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10**7
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else multiprocessing.cpu_count()
+
+    rng = np.random.RandomState(0)
+    x = rng.randint(0, 2000, n_points)
+    y = rng.randint(0, 1000, n_points)
+
+    print '{} points, {} cores'.format(n_points, multiprocessing.cpu_count())
+    print '{:<16}{:>8}{:>12}{:>10}'.format('canvas', 'workers', 'time [s]', 'speedup')
+    for canvas_class in (RasterCanvas, DensityCanvas):
+        base = None
+        workers = 1
+        while workers <= max_workers:
+            t = best_time(canvas_class, x, y, workers)
+            base = base or t
+            print '{:<16}{:>8}{:>12.3f}{:>10.2f}'.format(canvas_class.__name__, workers, t, base / t)
+            workers *= 2
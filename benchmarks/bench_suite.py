@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+"""
+Benchmarks of the rendering hot paths, for comparing the performance of
+different commits.
+
+Every case is run in an interpreter of its own, so that the peak memory
+of one case doesn't hide the next. For every case the best and mean time
+of the runs, the peak memory of the process, its growth while the case
+was run, and the size of the rendered output in bytes are written as
+JSON.
+
+Usage:
+    bench_suite.py [-o results.json] [-r repeat] [-c old_results.json] [pattern ...]
+
+Only cases whose id contains one of the patterns are run. With -c, the
+times are compared to an earlier result file.
+"""
+from __future__ import unicode_literals
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from termplotlib.colors import TRUECOLOR, set_color_depth
+from termplotlib.raster import RasterCanvas
+from termplotlib.layout import Row, Column
+from termplotlib.text import TextBox
+from termplotlib import letters
+
+
+def _random_canvas(width, height, points, seed=0):
+    rng = np.random.RandomState(seed)
+    canvas = RasterCanvas(width, height)
+    colors = ['red', 'blue', (0, 128, 255)]
+    for color in colors:
+        n = points // len(colors)
+        canvas.set(rng.randint(0, width, n), rng.randint(0, height, n), color)
+    return canvas
+
+
+def bench_set(width, height, points):
+    rng = np.random.RandomState(0)
+    x = rng.randint(0, width, points)
+    y = rng.randint(0, height, points)
+    canvas = RasterCanvas(width, height)
+
+    def prepare():
+        canvas.reset()
+
+    def run():
+        canvas.set(x, y, 'red')
+    return prepare, run
+
+
+def bench_get_rows(width, height, points):
+    canvas = _random_canvas(width, height, points)
+
+    def prepare():
+        canvas.invalidate()
+
+    def run():
+        return canvas.get_rows()
+    return prepare, run
+
+
+def bench_stretch(width, height, points):
+    state = {}
+
+    def prepare():
+        state['canvas'] = _random_canvas(width, height, points)
+
+    def run():
+        state['canvas'].stretch(2 * width, 2 * height)
+    return prepare, run
+
+
+def bench_layout(width, height, depth, cached):
+    """A row of columns of rows and so on, depth levels deep, with two canvases at every level.
+
+    Without cached a new layout is rendered every run. With cached the same layout
+    is rendered again, which only measures reusing the cells and rows of the canvases.
+    """
+    def nested(level):
+        canvases = [_random_canvas(width, height, width * height // 8, seed=level),
+                    TextBox(width, height, text='level {}'.format(level))]
+        if level < depth:
+            canvases.append(nested(level + 1))
+        return Row(canvases) if level % 2 == 0 else Column(canvases)
+    state = {'layout': nested(1)}
+
+    def prepare():
+        if cached:
+            state['layout']._modified()
+        else:
+            state['layout'] = nested(1)
+
+    def run():
+        return state['layout'].get_rows()
+    return prepare, run
+
+
+def bench_textbox(width, height, lines):
+    text = '\n'.join('line {} of the text box'.format(i) for i in range(lines))
+    box = TextBox(width, height, text=text, color='red', background='grey', border_color='blue')
+
+    def prepare():
+        box._modified()
+
+    def run():
+        return box.get_rows()
+    return prepare, run
+
+
+def bench_text(length, cached):
+    text = ('The quick brown fox, jumps over the lazy dog! ' * (length // 46 + 1))[:length]
+
+    def prepare():
+        if not cached:
+            letters._patterns.clear()
+        else:
+            letters.get_pattern(text)
+
+    def run():
+        letters.Text(text)
+    return prepare, run
+
+
+# The benchmark functions and the parameters they are run with.
+CASES = [
+    (bench_set, [dict(width=w, height=h, points=n) for w, h in [(200, 100), (2000, 1000)]
+                 for n in [10**4, 10**6]]),
+    (bench_get_rows, [dict(width=w, height=h, points=n) for w, h in [(200, 100), (1000, 400)]
+                      for n in [10**3, 10**5]]),
+    (bench_stretch, [dict(width=w, height=h, points=10**4) for w, h in [(200, 100), (2000, 1000)]]),
+    (bench_layout, [dict(width=w, height=h, depth=d, cached=c) for w, h in [(60, 40), (200, 100)]
+                    for d in [2, 4] for c in [False, True]]),
+    (bench_textbox, [dict(width=w, height=h, lines=n) for w, h, n in [(80, 40, 5), (400, 400, 80)]]),
+    (bench_text, [dict(length=n, cached=c) for n in [10, 200] for c in [False, True]]),
+]
+
+
+def case_id(func, params):
+    return '{}[{}]'.format(func.__name__[len('bench_'):],
+                           ','.join('{}={}'.format(k, params[k]) for k in sorted(params)))
+
+
+def get_cases():
+    return [(case_id(func, params), func, params) for func, all_params in CASES for params in all_params]
+
+
+def max_rss():
+    """Return the peak memory used by the process in kB (Linux) or bytes (macOS)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_case(func, params, repeat):
+    """Run a case repeat times and return its result."""
+    prepare, run = func(**params)
+    rss_before = max_rss()
+    times = []
+    output = None
+    for i in range(repeat):
+        prepare()
+        start = time.time()
+        output = run()
+        times.append(time.time() - start)
+
+    result = dict(best_s=min(times), mean_s=sum(times) / len(times), repeat=repeat,
+                  peak_rss=max_rss(), rss_growth=max_rss() - rss_before)
+    if output is not None:
+        result['bytes_per_frame'] = len('\n'.join(output).encode('utf-8'))
+    return result
+
+
+def run_in_subprocess(name, repeat):
+    command = [sys.executable, __file__, '--case', name, '-r', str(repeat)]
+    return json.loads(subprocess.check_output(command))
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.STDOUT).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, old_results):
+    old = dict((r['id'], r) for r in old_results['results'])
+    print '{:<60}{:>12}{:>12}{:>8}'.format('case', 'old [ms]', 'new [ms]', 'ratio')
+    for result in results['results']:
+        if result['id'] not in old:
+            continue
+        old_time = old[result['id']]['best_s']
+        print '{:<60}{:>12.3f}{:>12.3f}{:>8.2f}'.format(result['id'], old_time * 1000, result['best_s'] * 1000,
+                                                       result['best_s'] / old_time if old_time else float('nan'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('patterns', nargs='*', help='only run cases whose id contains one of these')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='the number of runs of every case')
+    parser.add_argument('-o', '--output', help='the file to write the results to, instead of stdout')
+    parser.add_argument('-c', '--compare', help='an earlier result file to compare the times to')
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # The output size depends on the color depth, so use the same one everywhere.
+    set_color_depth(TRUECOLOR)
+
+    cases = dict((name, (func, params)) for name, func, params in get_cases())
+    if args.case:
+        func, params = cases[args.case]
+        print json.dumps(run_case(func, params, args.repeat))
+        sys.exit()
+
+    results = []
+    for name, func, params in get_cases():
+        if args.patterns and not any(p in name for p in args.patterns):
+            continue
+        result = run_in_subprocess(name, args.repeat)
+        result.update(id=name, case=func.__name__[len('bench_'):], params=params)
+        results.append(result)
+        sys.stderr.write('{:<60}{:>10.3f} ms\n'.format(name, result['best_s'] * 1000))
+
+    results = dict(commit=get_commit(), python=platform.python_version(), numpy=np.__version__,
+                   platform=platform.platform(), rss_unit='B' if sys.platform == 'darwin' else 'kB',
+                   results=results)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print text
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
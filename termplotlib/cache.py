@@ -0,0 +1,40 @@
+"""
+A least recently used cache.
+"""
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+class LRUCache(object):
+    """
+    A mapping holding at most maxsize items. When it is full, the least
+    recently used item is dropped to make room for a new one.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+
+    def get(self, key, default=None):
+        """Return the item of key, or default if there is none."""
+        try:
+            value = self._items.pop(key)
+        except KeyError:
+            return default
+        self._items[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._items.pop(key, None)
+        self._items[key] = value
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def clear(self):
+        self._items.clear()
@@ -1,5 +1,25 @@
 import numpy as np
 
+from termplotlib import instrument
+from termplotlib.cache import LRUCache
+from termplotlib.screen import Screen
+
+def get_extent(placements, x=0, y=0):
+    """Return the column and row (in characters) just after the bottom right corner of all placements.
+
+    :param list placements: (canvas, x, y, width, height) tuples as returned by Canvas.arrange.
+    :param int x: The column to return if there are no placements.
+    :param int y: The row to return if there are no placements.
+    """
+    if not placements:
+        return x, y
+    return (max(px + c._to_c_width(w) for c, px, py, w, h in placements),
+            max(py + c._to_c_height(h) for c, px, py, w, h in placements))
+
+def _to_screen(job):
+    canvas, width, height = job
+    return canvas.to_screen(width, height)
+
 class Canvas(object):
     """Super class to all canvas objects."""
 
@@ -15,6 +35,14 @@ class Canvas(object):
                    'bottomcenter' : np.array([[0, 1],    [0.5, 0.5]]),
                    'topcenter'    : np.array([[1, 0],    [0.5, 0.5]]),
     }
+
+    # The number of rendered sizes kept for each canvas.
+    _cache_size = 8
+
+    _version = 0
+    _row_cache = None
+    _screen_cache = None
+
     def __init__(self, width=1, height=1, stretchable=True, alignment='center'):
         """ Create a canvas.
 
@@ -55,13 +83,139 @@ class Canvas(object):
         if alignment not in self._alignments:
             raise ValueError('Invalid alignment "{}"'.format(alignment))
         self._alignment = alignment
+        self._modified()
+
+    @property
+    def version(self):
+        """A value that changes every time the canvas is modified."""
+        return self._version
+
+    def _modified(self):
+        """Mark the canvas as modified, so that it is rendered again."""
+        self._version += 1
 
     def get_rows(self, width=None, height=None):
-        raise NotImplementedError('"get_rows" should be implemented by subclass!')
+        """Return the rendered rows of the canvas.
+
+        The rows are cached for the last few sizes, and rendered again only
+        after the canvas has been modified.
+        """
+        width, height = self._check_dimensions(width, height)
+        if self._row_cache is None:
+            self._row_cache = LRUCache(self._cache_size)
+
+        stats = instrument.current
+        if stats is not None:
+            frame = stats.start(self, 'get_rows')
+
+        key = (width, height, self.version)
+        rows = self._row_cache.get(key)
+        cache_hit = rows is not None
+        if rows is None:
+            rows = self._get_rows(width, height)
+            self._row_cache[key] = rows
+
+        if stats is not None:
+            stats.stop(frame, width, height, rows, cache_hit)
+        return list(rows)
+
+    def _get_rows(self, width, height):
+        return list(self._iter_rows(width, height))
+
+    def iter_rows(self, width=None, height=None):
+        """Yield the rendered rows of the canvas one at a time.
+
+        Rows are produced as they are rendered, so the first row is available
+        before the rest of the canvas has been rendered. Cached rows are
+        reused, but rows rendered here are not cached.
+        """
+        width, height = self._check_dimensions(width, height)
+        rows = self._row_cache.get((width, height, self.version)) if self._row_cache else None
+        if rows is None:
+            rows = self._iter_rows(width, height)
+        for row in rows:
+            yield row
+
+    def _iter_rows(self, width, height):
+        raise NotImplementedError('"_iter_rows" should be implemented by subclass!')
+
+    def write_to(self, stream, width=None, height=None):
+        """Write the canvas to a binary stream, encoded as UTF-8, one row at a time."""
+        for i, row in enumerate(self.iter_rows(width, height)):
+            if i > 0:
+                stream.write(b'\n')
+            stream.write(row.encode('utf-8'))
+
+    def arrange(self, width, height, x=0, y=0):
+        """Return where the canvases making up this canvas are placed.
+
+        :param int width: The width (in dots) given to the canvas.
+        :param int height: The height (in dots) given to the canvas.
+        :param int x: The column (in characters) of the left edge of the canvas.
+        :param int y: The row (in characters) of the top edge of the canvas.
+        :return: A list of (canvas, x, y, width, height) tuples for all canvases that draw
+        themselves, with positions in characters and sizes in dots.
+        """
+        return [(self, x, y, width, height)]
+
+    def draw(self, screen, x, y, width, height):
+        """Write the canvas into screen with its top left corner at character (x, y).
+
+        The rendered rows are split into cells once, and the cells are kept until
+        the size or the canvas changes.
+
+        :return: The number of cells that were rendered, 0 if the kept cells were used.
+        """
+        width, height = self._check_dimensions(width, height)
+        key = (width, height, self.version)
+        n_rendered = 0
+        if self._screen_cache is None or self._screen_cache[0] != key:
+            rows = self.get_rows(width, height)
+            cells = Screen(self._to_c_width(width), len(rows))
+            cells.write_rows(rows, 0, 0)
+            self._screen_cache = (key, cells)
+            n_rendered = cells.chars.size
+        screen.blit(self._screen_cache[1], x, y)
+        return n_rendered
+
+    def to_screen(self, width=None, height=None, executor=None):
+        """Draw the canvas and all canvases placed in it into a new Screen.
+
+        The canvases are first arranged, and then each of them writes its cells
+        straight into the screen.
+
+        :param executor: (optional) An object with a map method that keeps the order of
+        the results, such as a multiprocessing or concurrent.futures pool. The canvases are
+        then drawn concurrently into screens of their own, which are copied into the screen.
+        """
+        width, height = self._check_dimensions(width, height)
+        placements = self.arrange(width, height)
+        screen = Screen(*get_extent(placements))
+
+        stats = instrument.current
+        if executor is None:
+            for canvas, x, y, w, h in placements:
+                if stats is None:
+                    canvas.draw(screen, x, y, w, h)
+                else:
+                    frame = stats.start(canvas, 'draw')
+                    n_rendered = canvas.draw(screen, x, y, w, h)
+                    stats.stop(frame, cells=n_rendered, cache_hit=n_rendered == 0)
+        else:
+            screens = executor.map(_to_screen, [(c, w, h) for c, x, y, w, h in placements])
+            for (canvas, x, y, w, h), canvas_screen in zip(placements, screens):
+                screen.blit(canvas_screen, x, y)
+        return screen
 
     def to_unicode(self, width=None, height=None):
+        stats = instrument.current
+        if stats is not None:
+            frame = stats.start(self, 'to_unicode')
         rows = self.get_rows(width, height)
-        return '\n'.join(rows).encode('utf-8')
+        text = '\n'.join(rows).encode('utf-8')
+        if stats is not None:
+            stats.stop(frame)
+        return text
 
     def __str__(self):
         return self.to_unicode()
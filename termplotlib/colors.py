@@ -3,9 +3,17 @@ Convenience functions for colors in terminals
 """
 from __future__ import unicode_literals
 
+import os
+
+import numpy as np
+
 CSI = '\033['
 OSC = '\033]'
 
+# The color depths escapes can be produced for.
+TRUECOLOR = 2**24
+DEPTHS = [16, 256, TRUECOLOR]
+
 # Some convenience names for common colors that are outside.
 EXTRA_NAMES = {'ORANGE'            : 208,
                'PINK'              : 218,
@@ -267,26 +275,72 @@ XTERM_NAMES = {'MAROON'            : 1,
 
 
 class AnsiCodes(object):
+    """
+    The escape sequences of a group of ANSI codes, as attributes named
+    after the codes.
+
+    The escapes of all 256 indexed colors are built once, when first used,
+    and escapes of RGB colors are cached, so looking up a color does not
+    build a new string.
+
+    Colors are written with the fewest bytes the color depth allows, and
+    colors the depth doesn't have are replaced by the closest color it has,
+    see set_color_depth.
+    """
+
+    # The highest number of RGB escapes that are kept.
+    _rgb_cache_size = 4096
+
+    _depth = TRUECOLOR
 
     def __init__(self):
         attrs = [n for n in dir(self) if not n.startswith('_')]
         for name in attrs:
             value = getattr(self, name)
-            setattr(self, name, AnsiCodes.code_to_str(value))
-
-        if hasattr(self, '_256_ESC'):
-            for name, val in XTERM_NAMES.iteritems():
-                code = list(self._256_ESC)
-                code.append(val)
-                setattr(self, name, AnsiCodes.code_to_str(code))
-            for name, val in EXTRA_NAMES.iteritems():
-                code = list(self._256_ESC)
-                code.append(val)
-                setattr(self, name, AnsiCodes.code_to_str(code))
+            if type(value) in (int, list):
+                setattr(self, name, AnsiCodes.code_to_str(value))
 
         if hasattr(self, '_RGB_ESC'):
             setattr(self, 'RGB', self._RGB)
 
+        self.set_depth(self._depth)
+
+    def set_depth(self, depth):
+        """Set the color depth of the escapes, one of DEPTHS.
+
+        Escapes looked up before are not changed.
+        """
+        if depth not in DEPTHS:
+            raise ValueError('Invalid color depth {}'.format(depth))
+        self._depth = depth
+        if '_indexed' in self.__dict__:
+            self._build_indexed()
+        self._rgb = {}
+        # Escapes by the names they have been looked up with.
+        self._names = {}
+
+    def _build_indexed(self):
+        """Build the escapes of the indexed colors and their names for the color depth."""
+        if self._depth >= 256:
+            self._indexed = [AnsiCodes.code_to_str(self._256_ESC + [i]) for i in range(256)]
+        else:
+            # The 16 colors have codes of their own, which are shorter.
+            basic = [AnsiCodes.code_to_str(self._16_BASE[i // 8] + i % 8) for i in range(16)]
+            self._indexed = [basic[i] for i in _get_nearest_16()]
+        self._indexed_array = np.array(self._indexed)
+        for name, val in XTERM_NAMES.iteritems():
+            setattr(self, name, self._indexed[val])
+        for name, val in EXTRA_NAMES.iteritems():
+            setattr(self, name, self._indexed[val])
+
+    def __getattr__(self, name):
+        # Only called for missing attributes. The indexed colors are built
+        # when first used, to keep importing the module fast.
+        if hasattr(type(self), '_256_ESC') and '_indexed' not in self.__dict__ and not name.startswith('__'):
+            self._build_indexed()
+            return getattr(self, name)
+        raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+
     @staticmethod
     def code_to_str(code):
         if type(code) == int:
@@ -295,13 +349,52 @@ class AnsiCodes(object):
             return CSI + ';'.join(map(str, code)) + 'm'
 
     def _RGB(self, r, g, b):
+        try:
+            return self._rgb[r, g, b]
+        except KeyError:
+            pass
         assert min([r, g, b]) >= 0 and max([r, g, b]) < 256
-        code = list(self._RGB_ESC)
-        code.extend([r, g, b])
-        return AnsiCodes.code_to_str(code)
+        if self._depth > 256:
+            code = AnsiCodes.code_to_str(self._RGB_ESC + [r, g, b])
+        else:
+            code = self._indexed[int(rgb2xterm((r, g, b)))]
+        # A plain dict that is emptied when full, since keeping track of the
+        # least recently used escape costs as much as building the escape.
+        if len(self._rgb) >= self._rgb_cache_size:
+            self._rgb.clear()
+        self._rgb[r, g, b] = code
+        return code
+
+    def indexed(self, index):
+        """Return the escape of one of the 256 indexed colors."""
+        return self._indexed[index]
+
+    def from_indices(self, indices):
+        """Return an array with the escape of every indexed color in an array of indices."""
+        return self._indexed_array[indices]
+
+    def from_rgb(self, rgb):
+        """Return an array with the escape of every color in an array of RGB values.
+
+        :param ndarray rgb: The colors, with the red, green and blue values (0-255) in
+        the last axis.
+        :return: An array with the shape of rgb without its last axis.
+        """
+        rgb = np.asarray(rgb, dtype=int)
+        if self._depth <= 256:
+            return self.from_indices(rgb2xterm(rgb))
+        packed = (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+        unique, inverse = np.unique(packed, return_inverse=True)
+        codes = np.array([self._RGB(c >> 16, (c >> 8) & 0xff, c & 0xff) for c in unique])
+        return codes[inverse].reshape(packed.shape)
 
     def __getitem__(self, name):
-        return getattr(self, name.upper())
+        try:
+            return self._names[name]
+        except KeyError:
+            code = getattr(self, name.upper())
+            self._names[name] = code
+            return code
 
 class AnsiForeGround(AnsiCodes):
     BLACK           = 30
@@ -324,6 +417,7 @@ class AnsiForeGround(AnsiCodes):
     LIGHT_CYAN    = 96
     LIGHT_WHITE   = 97
 
+    _16_BASE = [30, 90]
     _256_ESC = [38, 5]
     _RGB_ESC = [38, 2]
 
@@ -348,6 +442,7 @@ class AnsiBackGround(AnsiCodes):
     LIGHT_CYAN    = 106
     LIGHT_WHITE   = 107
 
+    _16_BASE = [40, 100]
     _256_ESC = [48, 5]
     _RGB_ESC = [48, 2]
 
@@ -361,10 +456,6 @@ class AnsiStyle(AnsiCodes):
     INVERSE   = 7
     RESET_ALL = 0
 
-fg = AnsiForeGround()
-bg = AnsiBackGround()
-st = AnsiStyle()
-
 def color_str(s, fg=None, bg=None, styles=None):
     """Return a string with ANSI formatting codes."""
     s_out = ''
@@ -399,13 +490,167 @@ def color_str(s, fg=None, bg=None, styles=None):
     return s_out
 
 def ycbcr2rgb(y, cB, cR):
-    r = int(np.clip((1.0 * y    + 0        * cB    + 1.402 * cR) * 255, 0, 255))
-    g = int(np.clip((1.0 * y    - 0.344136 * cB - 0.714136 * cR) * 255, 0, 255))
-    b = int(np.clip((1.0 * y    + 1.772    * cB        + 0 * cR) * 255, 0, 255))
+    """Convert colors from YCbCr to RGB.
+
+    :param y: The luma, from 0 to 1. A number or an array.
+    :param cB: The blue difference. A number or an array.
+    :param cR: The red difference. A number or an array.
+    :return: The (r, g, b) values from 0 to 255, as ints if all arguments are numbers
+    and as int arrays otherwise.
+    """
+    y, cB, cR = np.asarray(y), np.asarray(cB), np.asarray(cR)
+    r = np.clip((1.0 * y    + 0        * cB    + 1.402 * cR) * 255, 0, 255).astype(int)
+    g = np.clip((1.0 * y    - 0.344136 * cB - 0.714136 * cR) * 255, 0, 255).astype(int)
+    b = np.clip((1.0 * y    + 1.772    * cB        + 0 * cR) * 255, 0, 255).astype(int)
+    if r.ndim == 0:
+        return int(r), int(g), int(b)
     return r, g, b
 
+def rgb2ycbcr(r, g, b):
+    """Convert colors from RGB (0 to 255) to YCbCr, the inverse of ycbcr2rgb.
+
+    The arguments can be numbers or arrays, and the (y, cB, cR) values are
+    returned as floats or float arrays.
+    """
+    r, g, b = np.asarray(r) / 255.0, np.asarray(g) / 255.0, np.asarray(b) / 255.0
+    y = 0.299 * r + 0.587 * g + 0.114 * b
+    return y, (b - y) / 1.772, (r - y) / 1.402
+
+def _xterm_palette():
+    """Return the (r, g, b) values of the 256 xterm colors as an array."""
+    system = [(0, 0, 0), (128, 0, 0), (0, 128, 0), (128, 128, 0),
+              (0, 0, 128), (128, 0, 128), (0, 128, 128), (192, 192, 192),
+              (128, 128, 128), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+              (0, 0, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255)]
+    levels = np.array([0, 95, 135, 175, 215, 255])
+    cube = np.stack(np.meshgrid(levels, levels, levels, indexing='ij'), axis=-1).reshape(-1, 3)
+    grey = np.repeat(8 + 10 * np.arange(24), 3).reshape(-1, 3)
+    return np.concatenate([system, cube, grey]).astype(np.uint8)
+
+# The (r, g, b) values of the xterm colors, indexed like XTERM_NAMES.
+XTERM_RGB = _xterm_palette()
+
+# Every RGB value is looked up with this many bits per channel.
+_CUBE_BITS = 5
+
+# The nearest xterm color of every quantized RGB value, built when first used.
+_xterm_cube = None
+
+def _get_xterm_cube():
+    global _xterm_cube
+    if _xterm_cube is None:
+        # The centers of the quantized values, matched against the colors from
+        # 16 and up, since the first 16 are often changed by terminal themes.
+        step = 1 << (8 - _CUBE_BITS)
+        centers = np.arange(0, 256, step) + step // 2
+        r, g, b = np.meshgrid(centers, centers, centers, indexing='ij')
+        cube = np.empty(r.shape, dtype=np.uint8)
+        colors = XTERM_RGB[16:].astype(int)
+        for i in range(len(centers)):
+            dist = ((r[i, ..., None] - colors[:, 0]) ** 2 +
+                    (g[i, ..., None] - colors[:, 1]) ** 2 +
+                    (b[i, ..., None] - colors[:, 2]) ** 2)
+            cube[i] = 16 + dist.argmin(axis=-1)
+        _xterm_cube = cube
+    return _xterm_cube
+
+def rgb2xterm(rgb):
+    """Return the index of the closest xterm color of every color in an array.
+
+    The colors are looked up in a table of quantized RGB values, so a color
+    close to the middle of two xterm colors can get the slightly farther one.
+
+    :param ndarray rgb: The colors, with the red, green and blue values (0-255) in
+    the last axis.
+    :return: An array of indices from 16 to 255, with the shape of rgb without its
+    last axis.
+    """
+    rgb = np.asarray(rgb).astype(int) >> (8 - _CUBE_BITS)
+    return _get_xterm_cube()[rgb[..., 0], rgb[..., 1], rgb[..., 2]]
+
+# Colors at evenly spaced positions along each colormap, from the lowest to the highest value.
+COLORMAPS = {'viridis': [(68, 1, 84), (71, 44, 122), (59, 81, 139), (44, 113, 142), (33, 144, 141),
+                         (39, 173, 129), (92, 200, 99), (170, 220, 50), (253, 231, 37)],
+             'inferno': [(0, 0, 4), (31, 12, 72), (85, 15, 109), (136, 34, 106), (186, 54, 85),
+                         (227, 89, 51), (249, 140, 10), (249, 201, 50), (252, 255, 164)],
+             'grey':    [(0, 0, 0), (255, 255, 255)],
+}
+
+def colormap(values, name='viridis', vmin=None, vmax=None):
+    """Map an array of values to colors of a colormap.
+
+    :param values: The values, as a number or an array.
+    :param string name: The name of the colormap, see COLORMAPS.
+    :param vmin: The value mapped to the first color. Defaults to the lowest value.
+    :param vmax: The value mapped to the last color. Defaults to the highest value.
+    :return: A uint8 array with the (r, g, b) values of every value in its last axis.
+    """
+    try:
+        stops = np.array(COLORMAPS[name], dtype=float)
+    except KeyError:
+        raise ValueError('No colormap named "{}"'.format(name))
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return np.zeros(values.shape + (3,), dtype=np.uint8)
+    vmin = values.min() if vmin is None else vmin
+    vmax = values.max() if vmax is None else vmax
+    t = (values - vmin) / float(vmax - vmin) if vmax > vmin else np.zeros(values.shape)
+    positions = np.linspace(0, 1, len(stops))
+    rgb = [np.interp(np.clip(t, 0, 1), positions, stops[:, i]) for i in range(3)]
+    return np.round(np.stack(rgb, axis=-1)).astype(np.uint8)
+
+def colormap_colors(name, n):
+    """Return n colors evenly spaced along a colormap, as (r, g, b) tuples."""
+    return [tuple(int(c) for c in rgb) for rgb in colormap(np.linspace(0, 1, n), name, 0, 1)]
+
+def _get_nearest_16():
+    """Return the index of the closest of the first 16 xterm colors to each of the 256."""
+    colors = XTERM_RGB.astype(int)
+    dist = ((colors[:, None, :] - colors[None, :16, :]) ** 2).sum(axis=-1)
+    return dist.argmin(axis=1)
+
+def detect_color_depth(environ=None):
+    """Return the color depth of the terminal, guessed from the COLORTERM and TERM variables.
+
+    Without a TERM variable, the output is probably not going to a terminal
+    and the full depth is used. Most terminals support 256 colors even when
+    TERM doesn't say so, as with a plain xterm or screen, so only the Linux
+    console, dumb and vt* terminals are taken to have 16 colors.
+
+    :param dict environ: (optional) The environment variables. Defaults to os.environ.
+    """
+    if environ is None:
+        environ = os.environ
+    term = environ.get('TERM', '')
+    if environ.get('COLORTERM', '').lower() in ('truecolor', '24bit') or not term or 'direct' in term:
+        return TRUECOLOR
+    if term in ('dumb', 'linux') or term.startswith('vt'):
+        return 16
+    return 256
+
+def get_color_depth():
+    """Return the color depth of the escapes of fg and bg."""
+    return fg._depth
+
+def set_color_depth(depth=None):
+    """Set the color depth of the escapes of fg and bg, and thereby of everything drawn.
+
+    Until this is called, escapes are not downgraded and the full depth is
+    used. Set the depth before creating canvases, since they keep the escapes
+    of their colors.
+
+    :param int depth: (optional) One of DEPTHS. Detected from the environment if not given.
+    """
+    if depth is None:
+        depth = detect_color_depth()
+    fg.set_depth(depth)
+    bg.set_depth(depth)
+
+fg = AnsiForeGround()
+bg = AnsiBackGround()
+st = AnsiStyle()
+
 if __name__ == '__main__':
-    import numpy as np
     s = ''
     max_len = 0
     width = 8
@@ -448,6 +693,17 @@ if __name__ == '__main__':
         s += bg.RESET + '\n'
     print s
 
+    print "Test RGB colors quantized to xterm colors"
+    cB, cR = np.meshgrid(np.arange(-1.0, 1.01, 0.05), np.arange(1.0, -1.01, -0.05))
+    r, g, b = ycbcr2rgb(0.5, cB, cR)
+    codes = bg.from_indices(rgb2xterm(np.stack([r, g, b], axis=-1)))
+    print '\n'.join(''.join(c + '  ' for c in row) + bg.RESET for row in codes)
+
+    print "Test colormaps"
+    for name in sorted(COLORMAPS):
+        codes = bg.from_rgb(colormap(np.arange(64), name))
+        print ''.join(c + ' ' for c in codes) + bg.RESET + ' ' + name
+
     # Some examples:
     print "Some examples"
     print color_str('Hello world', fg='red', bg='green', styles=['bold'])
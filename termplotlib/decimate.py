@@ -0,0 +1,40 @@
+"""
+Reduction of large series to the points that affect the plot.
+"""
+from __future__ import unicode_literals
+
+import numpy as np
+
+
+def m4(x, y):
+    """Return the indices of the points needed to draw a path through x and y.
+
+    The points are split into runs of consecutive points in the same column.
+    For every run the first, last, lowest and highest point is kept, which
+    is enough to draw exactly the same dots as the full path when x and y
+    are dot coordinates. At most four points per run are kept, so a series
+    of any length is reduced to a few points per column of the canvas.
+
+    :param ndarray x: The x coordinates (in dots) of the points.
+    :param ndarray y: The y coordinates (in dots) of the points.
+    :return: The sorted indices of the points to keep.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(x)
+    if n == 0:
+        return np.arange(0)
+
+    starts = np.flatnonzero(np.r_[True, x[1:] != x[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    lengths = ends - starts + 1
+
+    # Find the first point in each run that reaches the minimum and maximum,
+    # by taking the smallest index among the points equal to the extreme value.
+    index = np.arange(n)
+    run_min = np.repeat(np.minimum.reduceat(y, starts), lengths)
+    run_max = np.repeat(np.maximum.reduceat(y, starts), lengths)
+    i_min = np.minimum.reduceat(np.where(y == run_min, index, n), starts)
+    i_max = np.minimum.reduceat(np.where(y == run_max, index, n), starts)
+
+    return np.unique(np.concatenate([starts, ends, i_min, i_max]))
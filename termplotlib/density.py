@@ -0,0 +1,121 @@
+"""
+Canvases showing the density of large sets of points.
+"""
+from __future__ import unicode_literals
+
+import numpy as np
+
+from termplotlib.colors import colormap_colors
+from termplotlib.raster import RasterCanvas
+from termplotlib import parallel
+
+class DensityCanvas(RasterCanvas):
+    """
+    A canvas of braille dots colored by the number of points in each
+    character cell.
+
+    Points are binned into a count per dot, so the memory used only
+    depends on the size of the canvas and not on the number of points.
+    """
+
+    # Default colors from the lowest to the highest density.
+    _default_ramp = ['darkblue', 'blue1', 'dodgerblue1', 'deepskyblue1', 'springgreen2',
+                     'chartreuse1', 'yellow1', 'gold1', 'orange1', 'darkorange', 'red1']
+
+    _scales = ['linear', 'log']
+
+    # The highest cell count, with the version and layout it was found for.
+    _max_count = None
+
+    def __init__(self, width, height, stretchable=True, alignment='center', background=None, ramp=None, scale='log'):
+        """Create a canvas.
+
+        :param int width: The width (in dots) of the canvas.
+        :param int height: The height (in dots) of the canvas.
+        :param string background: The background color of the canvas.
+        :param ramp: (optional) Colors, as names or (r, g, b) tuples, from the lowest to
+        the highest density, or the name of a colormap, see colors.COLORMAPS.
+        :param string scale: How counts are mapped to the ramp, 'linear' or 'log'.
+        """
+        if scale not in self._scales:
+            raise ValueError('Invalid scale "{}"'.format(scale))
+        if isinstance(ramp, basestring):
+            ramp = colormap_colors(ramp, len(self._default_ramp))
+        self._ramp = list(ramp) if ramp else self._default_ramp
+        self._scale = scale
+        super(DensityCanvas, self).__init__(width, height, stretchable, alignment, background=background)
+
+    def reset(self):
+        super(DensityCanvas, self).reset()
+        self._counts = np.zeros((self.height, self.width), dtype=np.uint32)
+
+    def _reset_colors(self):
+        super(DensityCanvas, self)._reset_colors()
+        # Colors of the ramp can share a palette entry, if they have the same escape.
+        self._ramp_indices = np.array([self._get_color_index(color) for color in self._ramp])
+
+    def set(self, x, y, color=None, mode='raise'):
+        """Add one or more points to the canvas.
+
+        :param x: The x coordinate(s) of the points.
+        :param y: The y coordinate(s) of the points.
+        :param color: Ignored, the points are colored by density.
+        :param string mode: How to handle points outside the canvas, see RasterCanvas.set.
+        """
+        x, y = self._check_coordinates(x, y, mode)
+        if self._use_workers(x):
+            counts = parallel.histogram(x, y, self._counts.shape, self.workers)
+        else:
+            counts = np.bincount(y * self.width + x, minlength=self.width * self.height)
+            counts = counts.reshape(self.height, self.width)
+        self._counts += counts.astype(self._counts.dtype)
+        self.pattern |= counts > 0
+        # Colors are relative to the highest density, so all rows might change.
+        self._dirty_rows[:] = True
+        self._modified()
+
+    def stretch(self, new_width, new_height):
+        padding = self.get_padding(new_width, new_height)
+        self._counts = np.pad(self._counts, padding, mode='constant')
+        super(DensityCanvas, self).stretch(new_width, new_height)
+
+    def _get_levels(self, cell_counts, max_count):
+        """Return the index in the ramp of every cell count."""
+        if self._scale == 'log':
+            cell_counts = np.log1p(cell_counts)
+            max_count = np.log1p(max_count)
+        levels = (cell_counts * len(self._ramp) / float(max(max_count, 1))).astype(int)
+        return np.minimum(levels, len(self._ramp) - 1)
+
+    def _get_cells(self, padding, c_width, rows):
+        pattern = self._get_padded_rows(self.pattern, rows, padding[0, 0], padding[1])
+        counts = self._get_padded_rows(self._counts, rows, padding[0, 0], padding[1])
+        codes = self._encode(pattern, c_width, len(rows))
+        cell_counts = self._to_blocks(counts, c_width, len(rows)).sum(axis=(1, 3))
+
+        max_count = self._get_max_count(padding, c_width)
+        colors = np.where(codes > 0, self._ramp_indices[self._get_levels(cell_counts, max_count)], 0)
+        return codes, colors
+
+    def _get_max_count(self, padding, c_width):
+        """Return the highest cell count of the whole canvas.
+
+        The densities are scaled by it, so it is kept until the canvas changes
+        instead of being found again for every batch of rows.
+        """
+        key = (self.version, self._counts.shape, tuple(padding.ravel()), c_width)
+        if self._max_count is not None and self._max_count[0] == key:
+            return self._max_count[1]
+        c_height = self._to_c_height(self.height + padding[0, :].sum())
+        all_counts = self._get_padded_rows(self._counts, np.arange(c_height), padding[0, 0], padding[1])
+        max_count = self._to_blocks(all_counts, c_width, c_height).sum(axis=(1, 3)).max()
+        self._max_count = (key, max_count)
+        return max_count
+
+if __name__ == '__main__':
+    c = DensityCanvas(160, 80)
+    n = 10**6
+    x = np.random.normal(80, 25, n).astype(int)
+    y = (40 + 0.3 * (x - 80) + np.random.normal(0, 10, n)).astype(int)
+    c.set(x, y, mode='drop')
+    print c
@@ -0,0 +1,105 @@
+"""
+Plotting of data that is too large to be read into memory at once.
+"""
+from __future__ import unicode_literals
+
+import numpy as np
+
+# Default number of samples read at a time.
+CHUNK_SIZE = 2**20
+
+_kinds = ['points', 'path']
+
+
+def open_array(source, dtype=None):
+    """Return source as an array without reading it into memory.
+
+    :param source: An ndarray (for example an np.memmap), which is returned as is, or
+    the path of a raw binary file, which is memory mapped read-only.
+    :param dtype: The data type of the file. Required if source is a path.
+    """
+    if isinstance(source, np.ndarray):
+        return source
+    if dtype is None:
+        raise ValueError('A dtype is needed to read "{}"'.format(source))
+    return np.memmap(source, dtype=dtype, mode='r')
+
+
+def iter_chunks(array, chunk_size=CHUNK_SIZE):
+    """Yield consecutive chunks of at most chunk_size samples of array, read into memory."""
+    for start in range(0, len(array), chunk_size):
+        yield np.asarray(array[start:start + chunk_size])
+
+
+def get_range(array, chunk_size=CHUNK_SIZE):
+    """Return the lowest and highest value of array, reading it chunk by chunk."""
+    lo, hi = np.inf, -np.inf
+    for chunk in iter_chunks(array, chunk_size):
+        if len(chunk) > 0:
+            lo = min(lo, chunk.min())
+            hi = max(hi, chunk.max())
+    return lo, hi
+
+
+def _to_dots(values, value_range, size):
+    """Map values in value_range to dot coordinates from 0 to size - 1."""
+    lo, hi = value_range
+    scale = (size - 1) / float(hi - lo) if hi > lo else 0.0
+    return np.round((values - lo) * scale).astype(int)
+
+
+def plot_chunked(canvas, y, x=None, dtype=None, kind='points', color=None, x_range=None, y_range=None,
+                 chunk_size=CHUNK_SIZE, mode='drop'):
+    """Plot data from memory mapped arrays or files, one chunk at a time.
+
+    Each chunk is read, scaled to dot coordinates and added to the canvas
+    before the next chunk is read, so the memory used is bounded by the
+    chunk size. Plotting points on a DensityCanvas accumulates the counts
+    of all chunks.
+
+    :param RasterCanvas canvas: The canvas to plot on.
+    :param y: The y values, as an array or the path of a raw binary file.
+    :param x: (optional) The x values, as an array or a path. Defaults to the sample index.
+    :param dtype: The data type of the files, if x or y is a path.
+    :param string kind: 'points' to plot every sample as a dot, or 'path' to draw lines
+    between consecutive samples. Paths are decimated per chunk, see RasterCanvas.plot_path.
+    :param string color: (optional) The color of the plot.
+    :param tuple x_range: (optional) The x values at the left and right edge of the canvas.
+    Found with an extra pass over the data if not given.
+    :param tuple y_range: (optional) The y values at the bottom and top edge of the canvas.
+    Found with an extra pass over the data if not given.
+    :param int chunk_size: The number of samples to read at a time.
+    :param string mode: How to handle samples outside the canvas, see RasterCanvas.set.
+    """
+    if kind not in _kinds:
+        raise ValueError('Invalid kind "{}"'.format(kind))
+
+    y = open_array(y, dtype)
+    if x is not None:
+        x = open_array(x, dtype)
+        assert len(x) == len(y)
+
+    if x_range is None:
+        x_range = get_range(x, chunk_size) if x is not None else (0, len(y) - 1)
+    if y_range is None:
+        y_range = get_range(y, chunk_size)
+
+    last = None
+    for start in range(0, len(y), chunk_size):
+        y_chunk = np.asarray(y[start:start + chunk_size])
+        if x is not None:
+            x_chunk = np.asarray(x[start:start + chunk_size])
+        else:
+            x_chunk = np.arange(start, start + len(y_chunk))
+        x_dots = _to_dots(x_chunk, x_range, canvas.width)
+        y_dots = _to_dots(y_chunk, y_range, canvas.height)
+
+        if kind == 'points':
+            canvas.set(x_dots, y_dots, color, mode)
+        else:
+            # Start from the last point of the previous chunk to connect the chunks.
+            if last is not None:
+                x_dots = np.r_[last[0], x_dots]
+                y_dots = np.r_[last[1], y_dots]
+            canvas.plot_path(x_dots, y_dots, color, mode)
+            last = x_dots[-1], y_dots[-1]
@@ -0,0 +1,204 @@
+"""
+Opt-in measurements of the time canvases take to render.
+
+Measuring is off by default, and costs one check per rendered canvas
+then. When it is on, every call to get_rows, draw and to_unicode of a
+canvas is timed. Time spent in canvases placed in a Row or Column is
+attributed to them, and only the remaining time to the layout itself.
+Canvases drawn on an executor are measured too, but as they are drawn
+on other threads their time is not subtracted from the layout.
+
+The escape bytes of canvases drawn into the screen of a Row or Column
+are only produced when the screen is turned into rows, so they are
+counted for the layout, and such canvases are reported with none.
+
+    with instrument.profile() as stats:
+        print dashboard
+    print stats.report()
+"""
+from __future__ import unicode_literals
+
+import threading
+import time
+from collections import namedtuple
+
+# The Stats that is collecting measurements, or None when measuring is off.
+current = None
+
+# A measured call. operation is 'get_rows', 'draw' or 'to_unicode', time is the
+# total time in seconds and self_time the part not spent in nested canvases.
+# cells is the number of character cells rendered, and escape_bytes the number
+# of bytes of escape sequences in the rendered rows. depth is the number of
+# measured calls the call was nested in.
+Event = namedtuple('Event', ['canvas', 'operation', 'time', 'self_time', 'cells', 'escape_bytes',
+                             'cache_hit', 'depth'])
+
+
+class CanvasStats(object):
+    """Totals of the measured calls of one canvas."""
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.calls = 0
+        self.cache_hits = 0
+        self.time = 0.0
+        self.self_time = 0.0
+        self.cells = 0
+        self.escape_bytes = 0
+
+    def add(self, event, nested):
+        """Add a call, where nested tells if it was made by another call of the same canvas."""
+        self.calls += 1
+        self.cache_hits += event.cache_hit
+        if not nested:
+            self.time += event.time
+        self.self_time += event.self_time
+        self.cells += event.cells
+        self.escape_bytes += event.escape_bytes
+
+
+class Stats(object):
+    """
+    Measurements of canvases, collected while measuring is on. The totals
+    of a canvas are found with stats[canvas].
+    """
+
+    def __init__(self, callback=None):
+        """
+        :param callback: (optional) A function called with an Event after every
+        measured call.
+        """
+        self.callback = callback
+        self._canvases = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __getitem__(self, canvas):
+        return self._canvases[canvas]
+
+    def __contains__(self, canvas):
+        return canvas in self._canvases
+
+    def __iter__(self):
+        return iter(self._canvases.values())
+
+    def clear(self):
+        with self._lock:
+            self._canvases.clear()
+
+    def _get_stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def start(self, canvas, operation):
+        """Start measuring a call, and return the frame to pass to stop."""
+        # [canvas, operation, start time, time of nested calls]
+        frame = [canvas, operation, time.time(), 0.0]
+        self._get_stack().append(frame)
+        return frame
+
+    def stop(self, frame, width=None, height=None, rows=None, cache_hit=False, cells=None):
+        """Stop measuring a call.
+
+        :param list frame: The frame returned by start.
+        :param int width: The width (in dots) the canvas was rendered with, if it was rendered.
+        :param int height: The height (in dots) the canvas was rendered with, if it was rendered.
+        :param list rows: The rows of text rendered, if any.
+        :param bool cache_hit: If the rows or cells were taken from the cache.
+        :param int cells: (optional) The number of cells rendered, when only some of the
+        cells were. By default all cells of width and height are counted.
+        """
+        elapsed = time.time() - frame[2]
+        stack = self._get_stack()
+        # Also drop the frames of calls that were stopped by an exception.
+        while stack and stack.pop() is not frame:
+            pass
+        if stack:
+            stack[-1][3] += elapsed
+
+        canvas = frame[0]
+        escape_bytes = 0
+        if cells is None:
+            cells = 0
+            if width is not None and not cache_hit:
+                cells = canvas._to_c_width(width) * canvas._to_c_height(height)
+        if rows is not None and not cache_hit:
+            # Escapes are ASCII, and everything else in a row is one character per cell.
+            escape_bytes = max(sum(len(row) for row in rows) - cells, 0)
+        nested = bool(stack) and stack[-1][0] is canvas
+        if nested:
+            # Cells rendered for a call of the same canvas, such as get_rows
+            # called by draw, are counted by that call.
+            cells = 0
+
+        event = Event(canvas, frame[1], elapsed, elapsed - frame[3], int(cells), escape_bytes,
+                      cache_hit, len(stack))
+        with self._lock:
+            if canvas not in self._canvases:
+                self._canvases[canvas] = CanvasStats(canvas)
+            self._canvases[canvas].add(event, nested)
+        if self.callback is not None:
+            self.callback(event)
+
+    def report(self):
+        """Return a table of the totals of all canvases, slowest first."""
+        lines = ['{:<32}{:>8}{:>8}{:>12}{:>12}{:>10}{:>14}'.format(
+            'canvas', 'calls', 'hits', 'time [ms]', 'self [ms]', 'cells', 'escape bytes')]
+        for s in sorted(self._canvases.values(), key=lambda s: s.time, reverse=True):
+            name = '{} at 0x{:x}'.format(type(s.canvas).__name__, id(s.canvas))
+            lines.append('{:<32}{:>8}{:>8}{:>12.3f}{:>12.3f}{:>10}{:>14}'.format(
+                name, s.calls, s.cache_hits, s.time * 1000, s.self_time * 1000, s.cells, s.escape_bytes))
+        return '\n'.join(lines)
+
+
+def enable(callback=None):
+    """Start measuring, and return the Stats the measurements are collected in.
+
+    :param callback: (optional) A function called with an Event after every measured call.
+    """
+    global current
+    current = Stats(callback)
+    return current
+
+
+def disable():
+    """Stop measuring."""
+    global current
+    current = None
+
+
+class profile(object):
+    """A context manager measuring everything rendered inside it, see enable."""
+
+    def __init__(self, callback=None):
+        self.callback = callback
+
+    def __enter__(self):
+        self._previous = current
+        return enable(self.callback)
+
+    def __exit__(self, *exc_info):
+        global current
+        current = self._previous
+
+if __name__ == '__main__':
+    import numpy as np
+    # Run as a script this is a module of its own, apart from the one canvases use.
+    from termplotlib import instrument
+    from termplotlib.raster import RasterCanvas
+    from termplotlib.text import TextBox
+    from termplotlib.layout import Row, Column
+
+    c1 = RasterCanvas(200, 100)
+    c1.set(np.random.randint(0, 200, 10**5), np.random.randint(0, 100, 10**5), color='red')
+    c2 = RasterCanvas(100, 100)
+    c2.plot_path(np.arange(100), (50 + 45 * np.sin(np.arange(100) / 10.0)).astype(int), color='blue')
+    dashboard = Row([Column([c1, TextBox(200, 24, text='Status')]), c2])
+
+    with instrument.profile() as stats:
+        print dashboard
+        print dashboard
+    print stats.report()
@@ -6,19 +6,34 @@ from __future__ import unicode_literals
 import numpy as np
 
 from raster import RasterCanvas
-from canvas import Canvas
+from canvas import Canvas, get_extent
+
+def _get_screen_rows(layout, width, height):
+    """Return the rows of a layout, reusing the rows that are unchanged since the last frame."""
+    screen = layout.to_screen(width, height, layout.executor)
+    rows = screen.get_rows(layout._last_frame)
+    layout._last_frame = (screen, rows)
+    return rows
 
 class Row(Canvas):
     """
     Places all canvases in a row with a height equal to the largest
     canvas.
+
+    All canvases in the row, including those in nested rows and columns,
+    are drawn into one shared screen which is turned into text once. If an
+    executor is given, see Canvas.to_screen, the canvases are drawn
+    concurrently on it. Only the executor of the outermost row or column
+    is used.
     """
 
-    def __init__(self, canvases=None, width=0, height=0, stretchable=True, alignment='center'):
+    def __init__(self, canvases=None, width=0, height=0, stretchable=True, alignment='center', executor=None):
         super(Row, self).__init__(width, height, stretchable, alignment)
         self.width = 0
         self.height = 0
         self.canvases = []
+        self.executor = executor
+        self._last_frame = None
         if canvases:
             for canvas in canvases:
                 self.add_canvas(canvas)
@@ -27,8 +42,14 @@ class Row(Canvas):
         self.height = max(self.height, canvas.height)
         self.width += canvas.width
         self.canvases.append(canvas)
+        self._modified()
+
+    @property
+    def version(self):
+        """A value that changes every time the row or any of its canvases is modified."""
+        return (self._version,) + tuple(canvas.version for canvas in self.canvases)
 
-    def get_rows(self, width=None, height=None):
+    def arrange(self, width, height, x=0, y=0):
         width, height = self._check_dimensions(width, height)
         total_stretch_width = width - self.width
         n_stretchable = len([c for c in self.canvases if c.stretchable])
@@ -37,25 +58,35 @@ class Row(Canvas):
         else:
             stretch_width = 0
 
-        rows = []
-        canvas_rows = []
+        placements = []
         for canvas in self.canvases:
-            c_rows = canvas.get_rows(canvas.width + stretch_width, height)
-            canvas_rows.append(c_rows)
-        for row_tuple in zip(*canvas_rows):
-            rows.append(''.join(row_tuple))
-        return rows
+            canvas_width = canvas.width + stretch_width
+            canvas_placements = canvas.arrange(canvas_width, height, x, y)
+            placements.extend(canvas_placements)
+            x = get_extent(canvas_placements, x, y)[0]
+        return placements
+
+    def _get_rows(self, width, height):
+        return _get_screen_rows(self, width, height)
+
+    def _iter_rows(self, width, height):
+        return self.to_screen(width, height, self.executor).iter_rows()
 
 class Column(Canvas):
     """
     Places all canvases in a column with a width equal to the largest
     canvas.
+
+    The canvases are drawn into one shared screen, and drawn concurrently
+    if an executor is given, see Row.
     """
 
-    def __init__(self, canvases=None, width=0, height=0, stretchable=True, alignment='center'):
+    def __init__(self, canvases=None, width=0, height=0, stretchable=True, alignment='center', executor=None):
         self.width = 0
         self.height = 0
         self.canvases = []
+        self.executor = executor
+        self._last_frame = None
         if canvases:
             for canvas in canvases:
                 self.add_canvas(canvas)
@@ -65,14 +96,27 @@ class Column(Canvas):
         self.width = max(self.width, canvas.width)
         self.height += canvas.height
         self.canvases.append(canvas)
+        self._modified()
 
-    def get_rows(self, width=None, height=None):
-        width, height = self._check_dimensions(width, height)
+    @property
+    def version(self):
+        """A value that changes every time the column or any of its canvases is modified."""
+        return (self._version,) + tuple(canvas.version for canvas in self.canvases)
 
-        rows = []
+    def arrange(self, width, height, x=0, y=0):
+        width, height = self._check_dimensions(width, height)
+        placements = []
         for canvas in self.canvases:
-            rows.extend(canvas.get_rows(width, canvas.height))
-        return rows
+            canvas_placements = canvas.arrange(width, canvas.height, x, y)
+            placements.extend(canvas_placements)
+            y = get_extent(canvas_placements, x, y)[1]
+        return placements
+
+    def _get_rows(self, width, height):
+        return _get_screen_rows(self, width, height)
+
+    def _iter_rows(self, width, height):
+        return self.to_screen(width, height, self.executor).iter_rows()
 
 if __name__ == '__main__':
 
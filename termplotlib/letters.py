@@ -1,375 +1,448 @@
 from __future__ import unicode_literals
 
+from collections import Mapping
+
 import numpy as np
 from raster import RasterCanvas
+from cache import LRUCache
+
+
+class _LazyDict(Mapping):
+    """A read-only mapping whose items are built by a function when first used."""
+
+    def __init__(self, build):
+        self._build = build
+        self._items = None
+
+    def _get_items(self):
+        if self._items is None:
+            self._items = self._build()
+        return self._items
+
+    def __getitem__(self, key):
+        return self._get_items()[key]
+
+    def __iter__(self):
+        return iter(self._get_items())
+
+    def __len__(self):
+        return len(self._get_items())
+
+
+def _build_letters():
+    return {
+        # Capital letters
+        'A' : np.array([[0, 0, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 1, 1, 0],
+                        [1, 0, 1, 0],
+                        [0, 1, 0, 0]], dtype=bool),
+        'B' : np.array([[0, 0, 0, 0],
+                        [1, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 1, 0, 0]], dtype=bool),
+        'C' : np.array([[0, 0, 0, 0],
+                        [0, 1, 1, 0],
+                        [1, 0, 0, 0],
+                        [1, 0, 0, 0],
+                        [1, 0, 0, 0],
+                        [0, 1, 1, 0]], dtype=bool),
+        'D' : np.array([[0, 0, 0, 0],
+                        [1, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 1, 0, 0]], dtype=bool),
+        'E' : np.array([[0, 0, 0, 0],
+                        [1, 1, 1, 0],
+                        [1, 0, 0, 0],
+                        [1, 1, 0, 0],
+                        [1, 0, 0, 0],
+                        [1, 1, 1, 0]], dtype=bool),
+        'F' : np.array([[0, 0, 0, 0],
+                        [1, 0, 0, 0],
+                        [1, 0, 0, 0],
+                        [1, 1, 0, 0],
+                        [1, 0, 0, 0],
+                        [1, 1, 1, 0]], dtype=bool),
+        'G' : np.array([[0, 0, 0, 0],
+                        [0, 1, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 0, 0],
+                        [0, 1, 1, 0]], dtype=bool),
+        'H' : np.array([[0, 0, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 1, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0]], dtype=bool),
+        'I' : np.array([[0, 0, 0, 0],
+                        [1, 1, 1, 0],
+                        [0, 1, 0, 0],
+                        [0, 1, 0, 0],
+                        [0, 1, 0, 0],
+                        [1, 1, 1, 0]], dtype=bool),
+        'J' : np.array([[0, 0, 0, 0],
+                        [0, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [0, 0, 1, 0],
+                        [1, 1, 1, 0]], dtype=bool),
+        'K' : np.array([[0, 0, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0]], dtype=bool),
+        'L' : np.array([[0, 0, 0, 0],
+                        [1, 1, 1, 0],
+                        [1, 0, 0, 0],
+                        [1, 0, 0, 0],
+                        [1, 0, 0, 0],
+                        [1, 0, 0, 0]], dtype=bool),
+        'M' : np.array([[0, 0, 0, 0, 0, 0],
+                        [1, 0, 0, 0, 1, 0],
+                        [1, 0, 0, 0, 1, 0],
+                        [1, 0, 1, 0, 1, 0],
+                        [1, 1, 0, 1, 1, 0],
+                        [1, 0, 0, 0, 1, 0]], dtype=bool),
+        'N' : np.array([[0, 0, 0, 0, 0],
+                        [1, 0, 0, 1, 0],
+                        [1, 0, 1, 1, 0],
+                        [1, 1, 1, 1, 0],
+                        [1, 1, 0, 1, 0],
+                        [1, 0, 0, 1, 0]], dtype=bool),
+        'O' : np.array([[0, 0, 0, 0],
+                        [0, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [0, 1, 0, 0]], dtype=bool),
+        'P' : np.array([[0, 0, 0, 0],
+                        [1, 0, 0, 0],
+                        [1, 0, 0, 0],
+                        [1, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 1, 0, 0]], dtype=bool),
+        'Q' : np.array([[0, 0, 0, 0],
+                        [0, 0, 1, 0],
+                        [0, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [0, 1, 0, 0]], dtype=bool),
+        'R' : np.array([[0, 0, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 1, 0, 0]], dtype=bool),
+        'S' : np.array([[0, 0, 0, 0],
+                        [1, 1, 0, 0],
+                        [0, 0, 1, 0],
+                        [0, 1, 0, 0],
+                        [1, 0, 0, 0],
+                        [0, 1, 1, 0]], dtype=bool),
+        'T' : np.array([[0, 0, 0, 0],
+                        [0, 1, 0, 0],
+                        [0, 1, 0, 0],
+                        [0, 1, 0, 0],
+                        [0, 1, 0, 0],
+                        [1, 1, 1, 0]], dtype=bool),
+        'U' : np.array([[0, 0, 0, 0],
+                        [1, 1, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0]], dtype=bool),
+        'V' : np.array([[0, 0, 0, 0],
+                        [0, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0]], dtype=bool),
+        'W' : np.array([[0, 0, 0, 0, 0, 0],
+                        [0, 1, 0, 1, 0, 0],
+                        [1, 0, 1, 0, 1, 0],
+                        [1, 0, 1, 0, 1, 0],
+                        [1, 0, 0, 0, 1, 0],
+                        [1, 0, 0, 0, 1, 0]], dtype=bool),
+        'X' : np.array([[0, 0, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [0, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0]], dtype=bool),
+        'Y' : np.array([[0, 0, 0, 0],
+                        [0, 1, 0, 0],
+                        [0, 1, 0, 0],
+                        [0, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0]], dtype=bool),
+        'Z' : np.array([[0, 0, 0, 0],
+                        [1, 1, 1, 0],
+                        [1, 0, 0, 0],
+                        [0, 1, 0, 0],
+                        [0, 0, 1, 0],
+                        [1, 1, 1, 0]], dtype=bool),
 
-LETTERS = {
-    # Capital letters
-    'A' : np.array([[0, 0, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 1, 1, 0],
-                    [1, 0, 1, 0],
-                    [0, 1, 0, 0]], dtype=bool),
-    'B' : np.array([[0, 0, 0, 0],
-                    [1, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 1, 0, 0]], dtype=bool),
-    'C' : np.array([[0, 0, 0, 0],
-                    [0, 1, 1, 0],
-                    [1, 0, 0, 0],
-                    [1, 0, 0, 0],
-                    [1, 0, 0, 0],
-                    [0, 1, 1, 0]], dtype=bool),
-    'D' : np.array([[0, 0, 0, 0],
-                    [1, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 1, 0, 0]], dtype=bool),
-    'E' : np.array([[0, 0, 0, 0],
-                    [1, 1, 1, 0],
-                    [1, 0, 0, 0],
-                    [1, 1, 0, 0],
-                    [1, 0, 0, 0],
-                    [1, 1, 1, 0]], dtype=bool),
-    'F' : np.array([[0, 0, 0, 0],
-                    [1, 0, 0, 0],
-                    [1, 0, 0, 0],
-                    [1, 1, 0, 0],
-                    [1, 0, 0, 0],
-                    [1, 1, 1, 0]], dtype=bool),
-    'G' : np.array([[0, 0, 0, 0],
-                    [0, 1, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 0, 0],
-                    [0, 1, 1, 0]], dtype=bool),
-    'H' : np.array([[0, 0, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 1, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0]], dtype=bool),
-    'I' : np.array([[0, 0, 0, 0],
-                    [1, 1, 1, 0],
-                    [0, 1, 0, 0],
-                    [0, 1, 0, 0],
-                    [0, 1, 0, 0],
-                    [1, 1, 1, 0]], dtype=bool),
-    'J' : np.array([[0, 0, 0, 0],
-                    [0, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [0, 0, 1, 0],
-                    [1, 1, 1, 0]], dtype=bool),
-    'K' : np.array([[0, 0, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0]], dtype=bool),
-    'L' : np.array([[0, 0, 0, 0],
-                    [1, 1, 1, 0],
-                    [1, 0, 0, 0],
-                    [1, 0, 0, 0],
-                    [1, 0, 0, 0],
-                    [1, 0, 0, 0]], dtype=bool),
-    'M' : np.array([[0, 0, 0, 0, 0, 0],
-                    [1, 0, 0, 0, 1, 0],
-                    [1, 0, 0, 0, 1, 0],
-                    [1, 0, 1, 0, 1, 0],
-                    [1, 1, 0, 1, 1, 0],
-                    [1, 0, 0, 0, 1, 0]], dtype=bool),
-    'N' : np.array([[0, 0, 0, 0, 0],
-                    [1, 0, 0, 1, 0],
-                    [1, 0, 1, 1, 0],
-                    [1, 1, 1, 1, 0],
-                    [1, 1, 0, 1, 0],
-                    [1, 0, 0, 1, 0]], dtype=bool),
-    'O' : np.array([[0, 0, 0, 0],
-                    [0, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [0, 1, 0, 0]], dtype=bool),
-    'P' : np.array([[0, 0, 0, 0],
-                    [1, 0, 0, 0],
-                    [1, 0, 0, 0],
-                    [1, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 1, 0, 0]], dtype=bool),
-    'Q' : np.array([[0, 0, 0, 0],
-                    [0, 0, 1, 0],
-                    [0, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [0, 1, 0, 0]], dtype=bool),
-    'R' : np.array([[0, 0, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 1, 0, 0]], dtype=bool),
-    'S' : np.array([[0, 0, 0, 0],
-                    [1, 1, 0, 0],
-                    [0, 0, 1, 0],
-                    [0, 1, 0, 0],
-                    [1, 0, 0, 0],
-                    [0, 1, 1, 0]], dtype=bool),
-    'T' : np.array([[0, 0, 0, 0],
-                    [0, 1, 0, 0],
-                    [0, 1, 0, 0],
-                    [0, 1, 0, 0],
-                    [0, 1, 0, 0],
-                    [1, 1, 1, 0]], dtype=bool),
-    'U' : np.array([[0, 0, 0, 0],
-                    [1, 1, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0]], dtype=bool),
-    'V' : np.array([[0, 0, 0, 0],
-                    [0, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0]], dtype=bool),
-    'W' : np.array([[0, 0, 0, 0, 0, 0],
-                    [0, 1, 0, 1, 0, 0],
-                    [1, 0, 1, 0, 1, 0],
-                    [1, 0, 1, 0, 1, 0],
-                    [1, 0, 0, 0, 1, 0],
-                    [1, 0, 0, 0, 1, 0]], dtype=bool),
-    'X' : np.array([[0, 0, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [0, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0]], dtype=bool),
-    'Y' : np.array([[0, 0, 0, 0],
-                    [0, 1, 0, 0],
-                    [0, 1, 0, 0],
-                    [0, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0]], dtype=bool),
-    'Z' : np.array([[0, 0, 0, 0],
-                    [1, 1, 1, 0],
-                    [1, 0, 0, 0],
-                    [0, 1, 0, 0],
-                    [0, 0, 1, 0],
-                    [1, 1, 1, 0]], dtype=bool),
+        # Lower case
+        'a' : np.array([[0, 0, 0, 0],
+                        [0, 1, 1, 0],
+                        [1, 0, 1, 0],
+                        [0, 1, 1, 0],
+                        [0, 0, 0, 0],
+                        [0, 0, 0, 0]], dtype=bool),
+        'b' : np.array([[0, 0, 0, 0],
+                        [1, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 1, 0, 0],
+                        [1, 0, 0, 0],
+                        [1, 0, 0, 0]], dtype=bool),
+        'c' : np.array([[0, 0, 0, 0],
+                        [0, 1, 1, 0],
+                        [1, 0, 0, 0],
+                        [0, 1, 1, 0],
+                        [0, 0, 0, 0],
+                        [0, 0, 0, 0]], dtype=bool),
+        'd' : np.array([[0, 0, 0, 0],
+                        [0, 1, 1, 0],
+                        [1, 0, 1, 0],
+                        [0, 1, 1, 0],
+                        [0, 0, 1, 0],
+                        [0, 0, 1, 0]], dtype=bool),
+        'e' : np.array([[0, 0, 0, 0],
+                        [0, 1, 1, 0],
+                        [1, 0, 0, 0],
+                        [1, 1, 1, 0],
+                        [0, 1, 0, 0],
+                        [0, 0, 0, 0]], dtype=bool),
+        'f' : np.array([[0, 0, 0],
+                        [1, 0, 0],
+                        [1, 0, 0],
+                        [1, 1, 0],
+                        [1, 0, 0],
+                        [0, 1, 1]], dtype=bool),
+        'g' : np.array([[1, 1, 0, 0],
+                        [0, 0, 1, 0],
+                        [0, 1, 1, 0],
+                        [1, 0, 1, 0],
+                        [0, 1, 1, 0],
+                        [0, 0, 0, 0]], dtype=bool),
+        'h' : np.array([[0, 0, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 1, 1, 0],
+                        [1, 0, 0, 0],
+                        [1, 0, 0, 0]], dtype=bool),
+        'i' : np.array([[0, 0],
+                        [1, 0],
+                        [1, 0],
+                        [0, 0],
+                        [1, 0],
+                        [0, 0]], dtype=bool),
+        'j' : np.array([[0, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [0, 0, 1, 0],
+                        [0, 0, 1, 0],
+                        [0, 0, 0, 0],
+                        [0, 0, 1, 0]], dtype=bool),
+        'k' : np.array([[0, 0, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 0, 0],
+                        [1, 0, 0, 0]], dtype=bool),
+        'l' : np.array([[0, 0],
+                        [1, 0],
+                        [1, 0],
+                        [1, 0],
+                        [1, 0],
+                        [1, 0]], dtype=bool),
+        'm' : np.array([[0, 0, 0, 0, 0, 0],
+                        [1, 0, 0, 0, 1, 0],
+                        [1, 0, 1, 0, 1, 0],
+                        [1, 1, 0, 1, 1, 0],
+                        [0, 0, 0, 0, 0, 0],
+                        [0, 0, 0, 0, 0, 0]], dtype=bool),
+        'n' : np.array([[0, 0, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 1, 0, 0],
+                        [0, 0, 0, 0],
+                        [0, 0, 0, 0]], dtype=bool),
+        'o' : np.array([[0, 0, 0, 0],
+                        [0, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [0, 1, 0, 0],
+                        [0, 0, 0, 0],
+                        [0, 0, 0, 0]], dtype=bool),
+        'p' : np.array([[1, 0, 0, 0],
+                        [1, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 1, 0, 0],
+                        [0, 0, 0, 0],
+                        [0, 0, 0, 0]], dtype=bool),
+        'q' : np.array([[0, 0, 1, 0],
+                        [0, 1, 1, 0],
+                        [1, 0, 1, 0],
+                        [0, 1, 1, 0],
+                        [0, 0, 0, 0],
+                        [0, 0, 0, 0]], dtype=bool),
+        'r' : np.array([[0, 0, 0, 0],
+                        [1, 0, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 1, 1, 0],
+                        [0, 0, 0, 0],
+                        [0, 0, 0, 0]], dtype=bool),
+        's' : np.array([[0, 0, 0],
+                        [1, 0, 0],
+                        [0, 1, 0],
+                        [1, 0, 0],
+                        [0, 1, 0],
+                        [0, 0, 0]], dtype=bool),
+        't' : np.array([[0, 0, 0, 0],
+                        [0, 1, 1, 0],
+                        [0, 1, 0, 0],
+                        [1, 1, 1, 0],
+                        [0, 1, 0, 0],
+                        [0, 0, 0, 0]], dtype=bool),
+        'u' : np.array([[0, 0, 0, 0],
+                        [1, 1, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [0, 0, 0, 0],
+                        [0, 0, 0, 0]], dtype=bool),
+        'v' : np.array([[0, 0, 0, 0],
+                        [0, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [0, 0, 0, 0],
+                        [0, 0, 0, 0]], dtype=bool),
+        'w' : np.array([[0, 0, 0, 0, 0, 0],
+                        [0, 1, 0, 1, 0, 0],
+                        [1, 0, 1, 0, 1, 0],
+                        [1, 0, 0, 0, 1, 0],
+                        [0, 0, 0, 0, 0, 0],
+                        [0, 0, 0, 0, 0, 0]], dtype=bool),
+        'x' : np.array([[0, 0, 0, 0],
+                        [1, 0, 1, 0],
+                        [0, 1, 0, 0],
+                        [1, 0, 1, 0],
+                        [0, 0, 0, 0],
+                        [0, 0, 0, 0]], dtype=bool),
+        'y' : np.array([[0, 1, 1, 0],
+                        [0, 0, 1, 0],
+                        [0, 1, 1, 0],
+                        [1, 0, 1, 0],
+                        [1, 0, 1, 0],
+                        [0, 0, 0, 0]], dtype=bool),
+        'z' : np.array([[0, 0, 0, 0],
+                        [1, 1, 1, 0],
+                        [1, 0, 0, 0],
+                        [0, 0, 1, 0],
+                        [1, 1, 1, 0],
+                        [0, 0, 0, 0]], dtype=bool),
 
-    # Lower case
-    'a' : np.array([[0, 0, 0, 0],
-                    [0, 1, 1, 0],
-                    [1, 0, 1, 0],
-                    [0, 1, 1, 0],
-                    [0, 0, 0, 0],
-                    [0, 0, 0, 0]], dtype=bool),
-    'b' : np.array([[0, 0, 0, 0],
-                    [1, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 1, 0, 0],
-                    [1, 0, 0, 0],
-                    [1, 0, 0, 0]], dtype=bool),
-    'c' : np.array([[0, 0, 0, 0],
-                    [0, 1, 1, 0],
-                    [1, 0, 0, 0],
-                    [0, 1, 1, 0],
-                    [0, 0, 0, 0],
-                    [0, 0, 0, 0]], dtype=bool),
-    'd' : np.array([[0, 0, 0, 0],
-                    [0, 1, 1, 0],
-                    [1, 0, 1, 0],
-                    [0, 1, 1, 0],
-                    [0, 0, 1, 0],
-                    [0, 0, 1, 0]], dtype=bool),
-    'e' : np.array([[0, 0, 0, 0],
-                    [0, 1, 1, 0],
-                    [1, 0, 0, 0],
-                    [1, 1, 1, 0],
-                    [0, 1, 0, 0],
-                    [0, 0, 0, 0]], dtype=bool),
-    'f' : np.array([[0, 0, 0],
-                    [1, 0, 0],
-                    [1, 0, 0],
-                    [1, 1, 0],
-                    [1, 0, 0],
-                    [0, 1, 1]], dtype=bool),
-    'g' : np.array([[1, 1, 0, 0],
-                    [0, 0, 1, 0],
-                    [0, 1, 1, 0],
-                    [1, 0, 1, 0],
-                    [0, 1, 1, 0],
-                    [0, 0, 0, 0]], dtype=bool),
-    'h' : np.array([[0, 0, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 1, 1, 0],
-                    [1, 0, 0, 0],
-                    [1, 0, 0, 0]], dtype=bool),
-    'i' : np.array([[0, 0],
-                    [1, 0],
-                    [1, 0],
-                    [0, 0],
-                    [1, 0],
-                    [0, 0]], dtype=bool),
-    'j' : np.array([[0, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [0, 0, 1, 0],
-                    [0, 0, 1, 0],
-                    [0, 0, 0, 0],
-                    [0, 0, 1, 0]], dtype=bool),
-    'k' : np.array([[0, 0, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 0, 0],
-                    [1, 0, 0, 0]], dtype=bool),
-    'l' : np.array([[0, 0],
-                    [1, 0],
-                    [1, 0],
-                    [1, 0],
-                    [1, 0],
-                    [1, 0]], dtype=bool),
-    'm' : np.array([[0, 0, 0, 0, 0, 0],
-                    [1, 0, 0, 0, 1, 0],
-                    [1, 0, 1, 0, 1, 0],
-                    [1, 1, 0, 1, 1, 0],
-                    [0, 0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0, 0]], dtype=bool),
-    'n' : np.array([[0, 0, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 1, 0, 0],
-                    [0, 0, 0, 0],
-                    [0, 0, 0, 0]], dtype=bool),
-    'o' : np.array([[0, 0, 0, 0],
-                    [0, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [0, 1, 0, 0],
-                    [0, 0, 0, 0],
-                    [0, 0, 0, 0]], dtype=bool),
-    'p' : np.array([[1, 0, 0, 0],
-                    [1, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 1, 0, 0],
-                    [0, 0, 0, 0],
-                    [0, 0, 0, 0]], dtype=bool),
-    'q' : np.array([[0, 0, 1, 0],
-                    [0, 1, 1, 0],
-                    [1, 0, 1, 0],
-                    [0, 1, 1, 0],
-                    [0, 0, 0, 0],
-                    [0, 0, 0, 0]], dtype=bool),
-    'r' : np.array([[0, 0, 0, 0],
-                    [1, 0, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 1, 1, 0],
-                    [0, 0, 0, 0],
-                    [0, 0, 0, 0]], dtype=bool),
-    's' : np.array([[0, 0, 0],
-                    [1, 0, 0],
-                    [0, 1, 0],
-                    [1, 0, 0],
-                    [0, 1, 0],
-                    [0, 0, 0]], dtype=bool),
-    't' : np.array([[0, 0, 0, 0],
-                    [0, 1, 1, 0],
-                    [0, 1, 0, 0],
-                    [1, 1, 1, 0],
-                    [0, 1, 0, 0],
-                    [0, 0, 0, 0]], dtype=bool),
-    'u' : np.array([[0, 0, 0, 0],
-                    [1, 1, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [0, 0, 0, 0],
-                    [0, 0, 0, 0]], dtype=bool),
-    'v' : np.array([[0, 0, 0, 0],
-                    [0, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [0, 0, 0, 0],
-                    [0, 0, 0, 0]], dtype=bool),
-    'w' : np.array([[0, 0, 0, 0, 0, 0],
-                    [0, 1, 0, 1, 0, 0],
-                    [1, 0, 1, 0, 1, 0],
-                    [1, 0, 0, 0, 1, 0],
-                    [0, 0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0, 0]], dtype=bool),
-    'x' : np.array([[0, 0, 0, 0],
-                    [1, 0, 1, 0],
-                    [0, 1, 0, 0],
-                    [1, 0, 1, 0],
-                    [0, 0, 0, 0],
-                    [0, 0, 0, 0]], dtype=bool),
-    'y' : np.array([[0, 1, 1, 0],
-                    [0, 0, 1, 0],
-                    [0, 1, 1, 0],
-                    [1, 0, 1, 0],
-                    [1, 0, 1, 0],
-                    [0, 0, 0, 0]], dtype=bool),
-    'z' : np.array([[0, 0, 0, 0],
-                    [1, 1, 1, 0],
-                    [1, 0, 0, 0],
-                    [0, 0, 1, 0],
-                    [1, 1, 1, 0],
-                    [0, 0, 0, 0]], dtype=bool),
+        # Separators
+        ' ' : np.array([[0, 0],
+                        [0, 0],
+                        [0, 0],
+                        [0, 0],
+                        [0, 0],
+                        [0, 0]], dtype=bool),
+        ',' : np.array([[1, 0],
+                        [0, 1],
+                        [0, 0],
+                        [0, 0],
+                        [0, 0],
+                        [0, 0]], dtype=bool),
+        '.' : np.array([[0, 0],
+                        [1, 0],
+                        [0, 0],
+                        [0, 0],
+                        [0, 0],
+                        [0, 0]], dtype=bool),
+        '!' : np.array([[0, 0],
+                        [1, 0],
+                        [0, 0],
+                        [1, 0],
+                        [1, 0],
+                        [1, 0]], dtype=bool),
 
-    # Separators
-    ' ' : np.array([[0, 0],
-                    [0, 0],
-                    [0, 0],
-                    [0, 0],
-                    [0, 0],
-                    [0, 0]], dtype=bool),
-    ',' : np.array([[1, 0],
-                    [0, 1],
-                    [0, 0],
-                    [0, 0],
-                    [0, 0],
-                    [0, 0]], dtype=bool),
-    '.' : np.array([[0, 0],
-                    [1, 0],
-                    [0, 0],
-                    [0, 0],
-                    [0, 0],
-                    [0, 0]], dtype=bool),
-    '!' : np.array([[0, 0],
-                    [1, 0],
-                    [0, 0],
-                    [1, 0],
-                    [1, 0],
-                    [1, 0]], dtype=bool),
 
+    }
 
-}
+# The glyph of every character, built when first used.
+LETTERS = _LazyDict(_build_letters)
+
+
+def _compile(letters):
+    """Pack the glyphs of letters side by side into one atlas.
+
+    :return: The atlas, and the first column and width of every glyph in it,
+    indexed by code point.
+    """
+    chars = sorted(letters)
+    height = max(letters[c].shape[0] for c in chars)
+    atlas = np.zeros((height, sum(letters[c].shape[1] for c in chars)), dtype=bool)
+    offsets = np.zeros(max(ord(c) for c in chars) + 1, dtype=int)
+    widths = np.zeros(len(offsets), dtype=int)
+    i = 0
+    for c in chars:
+        l_h, l_w = letters[c].shape
+        atlas[:l_h, i:i+l_w] = letters[c]
+        offsets[ord(c)] = i
+        widths[ord(c)] = l_w
+        i += l_w
+    return atlas, offsets, widths
+
+# The atlas of LETTERS, compiled when first used.
+_atlas = None
+
+def _get_atlas():
+    global _atlas
+    if _atlas is None:
+        _atlas = _compile(LETTERS)
+    return _atlas
+
+# Patterns of recently rendered strings.
+_patterns = LRUCache(maxsize=64)
+
+def get_pattern(text):
+    """Return the pattern of a string, with the glyphs of its characters side by side.
+
+    The returned array is shared and must not be modified.
+    """
+    pattern = _patterns.get(text)
+    if pattern is None:
+        missing = set(text).difference(LETTERS)
+        if missing:
+            raise KeyError(missing.pop())
+        atlas, offsets, widths = _get_atlas()
+        codes = np.frombuffer(text.encode('utf-32-le'), dtype='<u4').astype(int)
+        # The column in the atlas of every column of the string.
+        widths = widths[codes]
+        starts = np.cumsum(widths) - widths
+        columns = np.arange(widths.sum()) + np.repeat(offsets[codes] - starts, widths)
+        pattern = atlas[:, columns]
+        _patterns[text] = pattern
+    return pattern
 
 class Letter(RasterCanvas):
     def __init__(self, char):
-        pattern = LETTERS[char]
+        pattern = get_pattern(char)
         h, w = pattern.shape
-        super(Letter, self).__init__(h, w, pattern=pattern)
+        super(Letter, self).__init__(w, h, pattern=pattern)
 
 class Text(RasterCanvas):
     def __init__(self, text):
-        w = 0
-        h = 0
-        for c in text:
-            l_h, l_w = LETTERS[c].shape
-            w += l_w
-            h = max(h, l_h)
-        pattern = np.zeros((h, w), dtype=bool)
-        i = 0
-        for c in text:
-            l_h, l_w = LETTERS[c].shape
-            pattern[:, i:i+l_w] = LETTERS[c].copy()
-            i += l_w
-        super(Text, self).__init__(w, h, pattern)
+        pattern = get_pattern(text)
+        h, w = pattern.shape
+        super(Text, self).__init__(w, h, pattern=pattern)
 
 if __name__ == '__main__':
     print Text('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
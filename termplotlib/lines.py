@@ -20,6 +20,7 @@ class Line(Canvas):
     @color.setter
     def color(self, color):
         self._fg = fg[color] if color else ''
+        self._modified()
 
     @property
     def background(self):
@@ -28,6 +29,7 @@ class Line(Canvas):
     @background.setter
     def background(self, background):
         self._bg = bg[background] if background else ''
+        self._modified()
 
     @property
     def style(self):
@@ -39,8 +41,11 @@ class Line(Canvas):
             raise ValueError('Invalid style "{}"'.format(style))
         self._style = style
         self._line_char = self._line_chars[style]
+        self._modified()
 
     def _color_line(self, line):
+        if not (self._fg or self._bg):
+            return line
         return self._fg + self._bg + line + st.RESET_ALL
 
     def _get_line_char(self, row, col, n_rows, n_cols):
@@ -56,21 +61,18 @@ class HorizontalLine(Line):
     def _get_line_char(self, row, col, n_rows, n_cols):
         return self._line_char
 
-    def get_rows(self, width=None, height=None, alignment='center'):
-        width, height = self._check_dimensions(width, height)
+    def _iter_rows(self, width, height):
         pad_above = np.ceil((height - 4)/(2 * 4.0)).astype(int)
         pad_below = np.floor((height - 4)/(2 * 4.0)).astype(int)
         c_width = np.ceil(width / 2.0).astype(int)
         c_height = pad_above + pad_below + 1
 
-        lines_out = []
-
-        lines_out.extend([self._color_line(' ' * c_width) for i in range(pad_above)])
+        for i in range(pad_above):
+            yield self._color_line(' ' * c_width)
         line = ''.join([self._get_line_char(pad_above, i, c_height, c_width) for i in range(c_width)])
-        lines_out.append(self._color_line(line))
-        lines_out.extend([self._color_line(' ' * c_width) for i in range(pad_below)])
-
-        return lines_out
+        yield self._color_line(line)
+        for i in range(pad_below):
+            yield self._color_line(' ' * c_width)
 
 class VerticalLine(Line):
 
@@ -82,18 +84,16 @@ class VerticalLine(Line):
     def _get_line_char(self, row, col, n_rows, n_cols):
         return self._line_char
 
-    def get_rows(self, width=None, height=None, alignment='center'):
-        width, height = self._check_dimensions(width, height)
+    def _iter_rows(self, width, height):
         pad_before = np.ceil((width - 2)/(2 * 2.0)).astype(int)
         pad_after = np.floor((width - 2)/(2 * 2.0)).astype(int)
         c_height = np.ceil(height / 4.0).astype(int)
         c_width = pad_before + pad_after + 1
 
-        lines = [self._color_line(' ' * pad_before +
-                                  self._get_line_char(i, pad_before, c_height, c_width) +
-                                  ' ' * pad_after)
-                 for i in range(c_height)]
-        return lines
+        for i in range(c_height):
+            yield self._color_line(' ' * pad_before +
+                                   self._get_line_char(i, pad_before, c_height, c_width) +
+                                   ' ' * pad_after)
 
 
 class HorizontalArrow(HorizontalLine):
@@ -116,6 +116,7 @@ class HorizontalArrow(HorizontalLine):
         if direction not in self.directions:
             raise ValueError('Invalid direction "{}"'.format(direction))
         self._direction = direction
+        self._modified()
 
     def _get_line_char(self, row, col, n_rows, n_cols):
         if col == 0 and self.direction in ['left', 'both']:
@@ -145,6 +146,7 @@ class VerticalArrow(VerticalLine):
         if direction not in self.directions:
             raise ValueError('Invalid direction "{}"'.format(direction))
         self._direction = direction
+        self._modified()
 
     def _get_line_char(self, row, col, n_rows, n_cols):
         if row == 0 and self.direction in ['up', 'both']:
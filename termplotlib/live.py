@@ -0,0 +1,118 @@
+"""
+Rendering of canvases that are redrawn in place in the terminal.
+"""
+from __future__ import unicode_literals
+
+import sys
+
+import numpy as np
+
+from termplotlib.colors import CSI
+from termplotlib.screen import DEFAULT, serialize, change_state
+
+
+def cursor_position(row, col):
+    """Return a CSI sequence moving the cursor to the given (1-based) row and column."""
+    return CSI + '{};{}H'.format(row, col)
+
+
+class LiveRenderer(object):
+    """
+    Redraws a canvas in place by only emitting the cells that changed
+    since the previous frame.
+    """
+
+    def __init__(self, canvas, row=1, col=1):
+        """Create a renderer.
+
+        :param Canvas canvas: The canvas to render. Any canvas can be used, including rows and columns.
+        :param int row: The terminal row (starting at 1) of the top left corner of the canvas.
+        :param int col: The terminal column (starting at 1) of the top left corner of the canvas.
+        """
+        self.canvas = canvas
+        self.row = row
+        self.col = col
+        self.reset()
+
+    def reset(self):
+        """Forget the previous frame, so that the next frame is drawn in full."""
+        self._frame = None
+        # Palettes shared by all frames, so that cells of different frames can be compared.
+        self._fg_palette = [DEFAULT[:2]]
+        self._bg_palette = [DEFAULT[2]]
+
+    def _get_palette_map(self, palette, shared):
+        """Return an array mapping indices of palette to indices of the shared palette."""
+        for color in palette:
+            if color not in shared:
+                shared.append(color)
+        return np.array([shared.index(color) for color in palette], dtype=np.uint16)
+
+    def _get_frame(self, width, height):
+        """Draw the canvas and return its characters, foreground and background indices."""
+        screen = self.canvas.to_screen(width, height)
+        fg_map = self._get_palette_map(screen.fg_palette, self._fg_palette)
+        bg_map = self._get_palette_map(screen.bg_palette, self._bg_palette)
+        return screen.chars, fg_map[screen.fg], bg_map[screen.bg]
+
+    def render(self, width=None, height=None):
+        """Render the canvas and return the escape sequences that update the terminal.
+
+        Runs of changed cells are written after moving the cursor to their
+        first cell. Cells of the previous frame that fall outside of the new
+        frame are cleared.
+        """
+        frame = self._get_frame(width, height)
+        prev = self._frame
+
+        if prev is None:
+            changed = np.ones(frame[0].shape, dtype=bool)
+            cells = frame
+        else:
+            # Pad both frames with blank cells to the same size before comparing them.
+            shape = np.maximum(frame[0].shape, prev[0].shape)
+            def pad(array, fill):
+                padded = np.full(shape, fill, dtype=array.dtype)
+                padded[:array.shape[0], :array.shape[1]] = array
+                return padded
+            cells = [pad(a, fill) for a, fill in zip(frame, (ord(' '), 0, 0))]
+            old = [pad(a, fill) for a, fill in zip(prev, (ord(' '), 0, 0))]
+            changed = (cells[0] != old[0]) | (cells[1] != old[1]) | (cells[2] != old[2])
+
+        out = []
+        state = DEFAULT
+        for y in np.flatnonzero(changed.any(axis=1)):
+            edges = np.flatnonzero(np.diff(np.r_[False, changed[y], False]))
+            for start, end in zip(edges[::2], edges[1::2]):
+                out.append(cursor_position(self.row + y, self.col + start))
+                text, state = serialize(cells[0][y, start:end], cells[1][y, start:end], cells[2][y, start:end],
+                                        self._fg_palette, self._bg_palette, state)
+                out.append(text)
+
+        if state != DEFAULT:
+            out.append(change_state(state, DEFAULT))
+
+        self._frame = frame
+        return ''.join(out)
+
+    def draw(self, width=None, height=None, stream=None):
+        """Render the canvas and write the update to stream (stdout by default)."""
+        stream = stream or sys.stdout
+        stream.write(self.render(width, height).encode('utf-8'))
+        stream.flush()
+
+if __name__ == '__main__':
+    import time
+    import numpy as np
+    from termplotlib.raster import RasterCanvas
+
+    c = RasterCanvas(80, 40, background='navy')
+    renderer = LiveRenderer(c)
+    sys.stdout.write(CSI + '2J')
+    for i in range(200):
+        x = np.arange(80)
+        c.set(x, (20 + 19 * np.sin(x / 8.0 + i / 10.0)).astype(int), color='orange')
+        renderer.draw()
+        c.reset()
+        time.sleep(0.05)
+    print
@@ -0,0 +1,83 @@
+"""
+Rasterization of large point sets on several threads.
+
+The points are split into chunks that are rasterized on a thread pool,
+each into a buffer of its own, and the buffers are then merged. NumPy
+releases the GIL while indexing and counting, so the chunks are
+rasterized in parallel.
+"""
+from __future__ import unicode_literals
+
+import threading
+
+import numpy as np
+
+# The thread pools, by number of workers. They are created when first used
+# and kept for the rest of the process, as starting the threads of a pool
+# takes longer than rasterizing a chunk.
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_chunks(x, y, shape, workers, chunk_size):
+    """Split the points into at least one chunk per worker, and chunks of at most chunk_size points."""
+    n_chunks = workers
+    if chunk_size:
+        n_chunks = max(n_chunks, int(np.ceil(len(x) / float(chunk_size))))
+    return [(xc, yc, shape) for xc, yc in zip(np.array_split(x, n_chunks), np.array_split(y, n_chunks))]
+
+
+def _hits(args):
+    x, y, shape = args
+    hits = np.zeros(shape, dtype=bool)
+    hits[y, x] = True
+    return hits
+
+
+def _counts(args):
+    x, y, shape = args
+    height, width = shape
+    return np.bincount(y * width + x, minlength=height * width).reshape(shape)
+
+
+def _get_pool(workers):
+    """Return the thread pool with the given number of workers, creating it if needed."""
+    with _pools_lock:
+        if workers not in _pools:
+            # Imported here since importing multiprocessing takes longer than the rest of the package.
+            from multiprocessing.pool import ThreadPool
+            _pools[workers] = ThreadPool(workers)
+        return _pools[workers]
+
+
+def _reduce(func, merge, chunks, workers):
+    """Apply func to all chunks on a pool of threads and merge the results in place."""
+    result = None
+    for buf in _get_pool(workers).imap_unordered(func, chunks):
+        if result is None:
+            result = buf
+        else:
+            merge(result, buf, out=result)
+    return result
+
+
+def rasterize(x, y, shape, workers, chunk_size=None):
+    """Return a bool array of the given shape with the dots at y, x set.
+
+    :param ndarray x: The x coordinates of the dots. Must be inside the array.
+    :param ndarray y: The y coordinates of the dots. Must be inside the array.
+    :param tuple shape: The (height, width) of the array.
+    :param int workers: The number of threads to use.
+    :param int chunk_size: (optional) The highest number of points rasterized at once by a thread.
+    """
+    chunks = _get_chunks(x, y, shape, workers, chunk_size)
+    return _reduce(_hits, np.logical_or, chunks, workers)
+
+
+def histogram(x, y, shape, workers, chunk_size=None):
+    """Return an array of the given shape with the number of points at every dot.
+
+    The arguments are the same as for rasterize.
+    """
+    chunks = _get_chunks(x, y, shape, workers, chunk_size)
+    return _reduce(_counts, np.add, chunks, workers)
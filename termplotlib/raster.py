@@ -5,6 +5,8 @@ import numpy as np
 
 from termplotlib.colors import fg, bg
 from termplotlib.canvas import Canvas
+from termplotlib.decimate import m4
+from termplotlib import parallel
 
 class RasterCanvas(Canvas):
     """
@@ -17,6 +19,20 @@ class RasterCanvas(Canvas):
                                [0x02, 0x10],
                                [0x01, 0x08]])
 
+    # The approximate number of dots rasterized at once when drawing lines.
+    _line_batch_size = 2**20
+
+    # The number of threads used by set. Points are only rasterized on
+    # several threads when there are at least _parallel_threshold of them.
+    workers = 1
+    _parallel_threshold = 2**18
+
+    # The number of cell rows encoded at once when streaming rows.
+    _stream_rows = 16
+
+    # The character of every possible combination of braille bits in a cell.
+    _glyphs = [' '] + [unichr(0x2800 + code) for code in range(1, 256)]
+
     def __init__(self, width, height, stretchable=True, alignment='center', pattern=None, background=None):
         """Create a canvas.
 
@@ -31,7 +47,8 @@ class RasterCanvas(Canvas):
             height, width = pattern.shape
             self._set_size(width, height)
             self.pattern = pattern.copy()
-            self._color_map = np.zeros((self.height, self.width), dtype=str)
+            self._reset_colors()
+            self.invalidate()
         else:
             self._set_size(width, height)
             self.reset()
@@ -41,6 +58,15 @@ class RasterCanvas(Canvas):
         else:
             self.background = ''
 
+    @property
+    def background(self):
+        return self._background
+
+    @background.setter
+    def background(self, background):
+        self._background = background
+        self.invalidate()
+
     def _get_cell_dimensions(self, width, height):
         c_width  = np.ceil(width/2.0).astype(int)
         c_height = np.ceil(height/4.0).astype(int)
@@ -52,9 +78,50 @@ class RasterCanvas(Canvas):
 
     def reset(self):
         self.pattern = np.zeros((self.height, self.width), dtype=bool)
-        self._color_map = np.chararray((self.height, self.width), itemsize=64)
-        # Make sure the color map is initialized with empty strings.
-        self._color_map[:] = ''
+        self._reset_colors()
+        self.invalidate()
+
+    def invalidate(self):
+        """Render the full canvas on the next call to get_rows.
+
+        Only the character rows touched by set are rendered again by get_rows,
+        so this has to be called after changing pattern directly.
+        """
+        self._rendered = None
+        self._cell_cache = None
+        self._dirty_rows = np.zeros(self.height, dtype=bool)
+        self._modified()
+
+    def _reset_colors(self):
+        # Every dot stores an index into the palette of escape strings. Index 0
+        # is reserved for dots without a color.
+        self._color_map = np.zeros((self.height, self.width), dtype=np.uint8)
+        self._palette = ['']
+        self._palette_indices = {'': 0}
+
+    def _get_color_index(self, color):
+        """Return the palette index of color, adding it to the palette if needed.
+
+        :param color: A color name, an (r, g, b) tuple or None for no color.
+        :raises ValueError: If the palette is full. The indices are stored as uint16, so a
+        canvas holds at most 65535 different colors.
+        """
+        if type(color) == tuple:
+            color_str = fg.RGB(*color)
+        else:
+            color_str = fg[color] if color else ''
+        try:
+            return self._palette_indices[color_str]
+        except KeyError:
+            pass
+        index = len(self._palette)
+        if index > np.iinfo(np.uint16).max:
+            raise ValueError('Too many colors, a canvas holds at most {} different colors'.format(index - 1))
+        if index > np.iinfo(self._color_map.dtype).max:
+            self._color_map = self._color_map.astype(np.uint16)
+        self._palette.append(color_str)
+        self._palette_indices[color_str] = index
+        return index
 
     def stretch(self, new_width, new_height):
         padding = self.get_padding(new_width, new_height)
@@ -63,66 +130,375 @@ class RasterCanvas(Canvas):
         new_width = self.width + padding[1,:].sum()
         new_height = self.height + padding[0,:].sum()
         self._set_size(new_width, new_height)
+        self.invalidate()
+
+    def set(self, x, y, color=None, mode='raise'):
+        """Set one or more dots on the canvas.
 
-    def set(self, x, y, color=None):
-        # Check if the coordinates are iterable, otherwise put them into lists.
-        if hasattr(x, '__iter__'):
-            assert hasattr(y, '__iter__') and len(y) == len(x)
+        :param x: The x coordinate(s) of the dots. Either a scalar, a sequence or an ndarray.
+        :param y: The y coordinate(s) of the dots, with the same shape as x.
+        :param string color: (optional) The color of the dots.
+        :param string mode: How to handle coordinates outside the canvas. 'raise' raises
+        a ValueError, 'clip' moves the dots to the closest edge and 'drop' ignores them.
+        """
+        x, y = self._check_coordinates(x, y, mode)
+        if self._use_workers(x):
+            hits = parallel.rasterize(x, y, self.pattern.shape, self.workers)
+            self.pattern |= hits
+            self._color_map[hits] = self._get_color_index(color)
+            self._dirty_rows |= hits.any(axis=1)
         else:
-            x = [x]
-            y = [y]
-
-        color_str = fg[color] if color else ''
-
-        # Add all coordinates, one by one.
-        for xi, yi in zip(x, y):
-            if xi >= self.width or yi >= self.height:
-                raise ValueError('Coordinate ({}, {})is outside canvas size ({}, {})'
-                                 .format(xi, yi, self.width, self.height))
-            self.pattern[yi, xi] = True
-            self._color_map[yi, xi] = color_str
-
-    def _get_cell_pattern(self, pattern, x, y):
-        cell = pattern[y*4:(y+1)*4, x*2:(x+1)*2]
-        h, w = cell.shape
-        return np.pad(cell, ((0, 4-h),(0, 2-w)), mode='constant')
-
-    def _get_cell_color(self, cmap, x, y):
-        colors = cmap[y*4:(y+1)*4, x*2:(x+1)*2].flatten()
-        # Get the most used color for the cell
-        counts = {}
-        for c in colors:
-            if len(c) > 0:
-                counts[c] = counts.get(c, 0) + 1
-        if len(counts) > 0:
-            return sorted(counts, key=counts.get, reverse=True)[0]
-        return ''
-
-    def get_rows(self, width=None, height=None):
-        width, height = self._check_dimensions(width, height)
+            self.pattern[y, x] = True
+            self._color_map[y, x] = self._get_color_index(color)
+            self._dirty_rows[y] = True
+        self._modified()
+
+    def _use_workers(self, x):
+        """Return True if the points at x should be rasterized on several threads."""
+        return self.workers > 1 and len(x) >= self._parallel_threshold
+
+    def draw_line(self, x0, y0, x1, y1, color=None, mode='raise'):
+        """Draw one or more straight lines.
+
+        All lines are rasterized together, by stepping each line one dot at a
+        time along its longest axis.
+
+        :param x0: The x coordinate(s) of the start of the lines.
+        :param y0: The y coordinate(s) of the start of the lines.
+        :param x1: The x coordinate(s) of the end of the lines.
+        :param y1: The y coordinate(s) of the end of the lines.
+        :param string color: (optional) The color of the lines.
+        :param string mode: How to handle dots outside the canvas, see set.
+        """
+        x0, y0, x1, y1 = [np.asarray(a, dtype=int).ravel()
+                          for a in np.broadcast_arrays(x0, y0, x1, y1)]
+        n_dots = np.maximum(np.abs(x1 - x0), np.abs(y1 - y0)) + 1
+        if len(n_dots) == 0:
+            return
+
+        # Rasterize the lines in batches of roughly _line_batch_size dots, to
+        # bound the memory used for long lines.
+        ends = np.cumsum(n_dots)
+        splits = np.searchsorted(ends, np.arange(self._line_batch_size, ends[-1], self._line_batch_size)) + 1
+        for lines in np.split(np.arange(len(n_dots)), np.unique(splits)):
+            if len(lines) > 0:
+                x, y = self._get_line_dots(x0[lines], y0[lines], x1[lines], y1[lines], n_dots[lines])
+                self.set(x, y, color, mode)
+
+    def _get_line_dots(self, x0, y0, x1, y1, n_dots):
+        """Return the coordinates of all dots on the lines, which have n_dots dots each."""
+        dx = x1 - x0
+        dy = y1 - y0
+
+        # Index of the line and step along the line for every dot.
+        line = np.repeat(np.arange(len(n_dots)), n_dots)
+        step = np.arange(n_dots.sum()) - np.repeat(np.cumsum(n_dots) - n_dots, n_dots)
+        n_steps = np.maximum(n_dots - 1, 1)[line]
+
+        # Round to the closest dot with integer arithmetic.
+        x = x0[line] + (2 * dx[line] * step + n_steps) // (2 * n_steps)
+        y = y0[line] + (2 * dy[line] * step + n_steps) // (2 * n_steps)
+        return x, y
+
+    def plot_path(self, x, y, color=None, mode='raise', decimate=True):
+        """Draw lines connecting consecutive points.
+
+        :param x: The x coordinates of the points.
+        :param y: The y coordinates of the points.
+        :param string color: (optional) The color of the path.
+        :param string mode: How to handle dots outside the canvas, see set.
+        :param bool decimate: Only draw the first, last, lowest and highest point of
+        consecutive points in the same column, which draws the same dots much faster
+        when there are many points per column.
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=int))
+        y = np.atleast_1d(np.asarray(y, dtype=int))
+        assert x.shape == y.shape and x.ndim == 1
+
+        if decimate:
+            keep = m4(x, y)
+            x = x[keep]
+            y = y[keep]
+
+        if len(x) < 2:
+            self.set(x, y, color, mode)
+        else:
+            self.draw_line(x[:-1], y[:-1], x[1:], y[1:], color, mode)
+
+    def _check_coordinates(self, x, y, mode):
+        """Return x and y as integer arrays with the coordinates outside the canvas handled according to mode."""
+        if mode not in ('raise', 'clip', 'drop'):
+            raise ValueError('Invalid mode "{}"'.format(mode))
+
+        x = np.atleast_1d(np.asarray(x, dtype=int))
+        y = np.atleast_1d(np.asarray(y, dtype=int))
+        assert x.shape == y.shape
+
+        inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        if not inside.all():
+            if mode == 'raise':
+                i = np.argmin(inside)
+                raise ValueError('Coordinate ({}, {}) is outside canvas size ({}, {})'
+                                 .format(x.flat[i], y.flat[i], self.width, self.height))
+            elif mode == 'clip':
+                x = np.clip(x, 0, self.width - 1)
+                y = np.clip(y, 0, self.height - 1)
+            else:
+                x = x[inside]
+                y = y[inside]
+
+        return x, y
+
+    def _to_blocks(self, array, c_width, c_height):
+        """Pad array to a whole number of cells and reshape it into (c_height, 4, c_width, 2) blocks."""
+        h, w = array.shape
+        array = np.pad(array, ((0, c_height*4 - h), (0, c_width*2 - w)), mode='constant')
+        return array.reshape(c_height, 4, c_width, 2)
+
+    def _encode(self, pattern, c_width, c_height):
+        """Return the braille bits of every cell in pattern.
+
+        All cells are encoded with a single reduction against the dot values.
+        Since the dot values are disjoint bits, summing them is the same as
+        or:ing them together.
+        """
+        blocks = self._to_blocks(pattern, c_width, c_height)
+        bits = (self._dots - 0x2800).reshape(1, 4, 1, 2)
+        return (blocks * bits).sum(axis=(1, 3))
+
+    def _get_cell_colors(self, color_map, c_width, c_height):
+        """Return the palette index of the most used color in every cell.
+
+        The colors of all cells are counted at once with a single bincount over
+        (cell, palette index) pairs. Uncolored dots are not counted and cells
+        without any colored dots get index 0. If several colors are used equally
+        often in a cell, the one with the lowest palette index, i.e. the color
+        that was first used on the canvas, is chosen.
+        """
+        n_colors = len(self._palette)
+        blocks = self._to_blocks(color_map, c_width, c_height)
+        blocks = blocks.transpose(0, 2, 1, 3).reshape(c_height * c_width, 8)
+        cell_ids = np.arange(c_height * c_width).repeat(8) * n_colors
+        counts = np.bincount(cell_ids + blocks.ravel(), minlength=c_height * c_width * n_colors)
+        counts = counts.reshape(c_height * c_width, n_colors)
+        counts[:, 0] = 0
+        return counts.argmax(axis=1).reshape(c_height, c_width)
+
+    def _get_padded_rows(self, array, rows, offset, col_padding, size=4, columns=None):
+        """Return the rows of array that make up the given cell rows once it is padded.
+
+        :param ndarray array: The array to take rows from, with size rows per cell.
+        :param ndarray rows: Indices of the cell rows in the padded canvas.
+        :param int offset: The number of rows padded below the array.
+        :param col_padding: The number of columns padded before and after the array.
+        :param int size: The number of array rows in each cell row.
+        :param ndarray columns: (optional) The order in which to take the columns of array.
+        """
+        src = (rows[:, None] * size + np.arange(size)).ravel() - offset
+        inside = (src >= 0) & (src < array.shape[0])
+        out = np.zeros((len(src), array.shape[1]), dtype=array.dtype)
+        if columns is None:
+            out[inside] = array[src[inside]]
+        else:
+            out[inside] = array[np.ix_(src[inside], columns)]
+        return np.pad(out, ((0, 0), tuple(col_padding)), mode='constant')
+
+    def _get_cells(self, padding, c_width, rows):
+        """Return the braille bits and palette index of the cells in the given rows of the padded canvas."""
+        pattern = self._get_padded_rows(self.pattern, rows, padding[0, 0], padding[1])
+        color_map = self._get_padded_rows(self._color_map, rows, padding[0, 0], padding[1])
+        return (self._encode(pattern, c_width, len(rows)),
+                self._get_cell_colors(color_map, c_width, len(rows)))
+
+    def _get_row(self, codes, colors):
+        """Return a row of text from the braille bits and color indices of its cells.
+
+        Consecutive dots with the same color share one escape sequence. Empty
+        cells are written as spaces, which look the same in any foreground
+        color, so they don't end a run.
+        """
+        row = [self.background]
+        current = ''
+        for code, color in zip(codes, colors):
+            if code == 0:
+                row.append(' ')
+                continue
+            color = self._palette[color]
+            if color != current:
+                row.append(color if color else fg.RESET)
+                current = color
+            row.append(self._glyphs[code])
+        if current:
+            row.append(fg.RESET)
+        if self.background:
+            row.append(bg.RESET)
+        return ''.join(row)
+
+    def _update_cells(self, width, height):
+        """Return the cells of the canvas at the given size, encoding only the rows that have changed.
+
+        The cells are kept between calls, for the last size and padding used.
+
+        :return: A (key, codes, colors, chars, row_versions) tuple with the size and padding
+        of the cells, their braille bits, palette indices (0 for empty cells) and code points,
+        bottom row first, and the version of the canvas each cell row was last encoded at,
+        and the number of cell rows that were encoded.
+        """
         padding = self.get_padding(width, height)
-        pattern = np.pad(self.pattern, padding, mode='constant')
-        color_map = np.pad(self._color_map, padding, mode='constant')
+        c_width, c_height = self._get_cell_dimensions(width, height)
+
+        key = (width, height, tuple(padding.ravel()))
+        if self._cell_cache is not None and self._cell_cache[0] == key:
+            key, codes, colors, chars, row_versions = self._cell_cache
+            dirty = np.unique((np.flatnonzero(self._dirty_rows) + padding[0, 0]) // 4)
+        else:
+            codes = np.zeros((c_height, c_width), dtype=np.uint8)
+            colors = np.zeros((c_height, c_width), dtype=np.uint16)
+            chars = np.zeros((c_height, c_width), dtype=np.uint32)
+            row_versions = np.zeros(c_height, dtype=int)
+            dirty = np.arange(c_height)
+
+        if len(dirty) > 0:
+            dirty_codes, dirty_colors = self._get_cells(padding, c_width, dirty)
+            codes[dirty] = dirty_codes
+            colors[dirty] = np.where(dirty_codes > 0, dirty_colors, 0)
+            chars[dirty] = np.where(dirty_codes > 0, 0x2800 + dirty_codes, ord(' '))
+            row_versions[dirty] = self._version
+
+        self._cell_cache = (key, codes, colors, chars, row_versions)
+        self._dirty_rows[:] = False
+        return self._cell_cache, len(dirty)
+
+    def draw(self, screen, x, y, width, height):
+        width, height = self._check_dimensions(width, height)
+        (key, codes, colors, chars, row_versions), n_encoded = self._update_cells(width, height)
+
+        # Map the palette of the canvas to the palette of the screen.
+        fg_map = np.array([screen.get_state_indices(color)[0] for color in self._palette], dtype=np.uint16)
+        bg_index = screen.get_state_indices(self.background)[1]
+
+        # The screen is stored top row first.
+        screen.write_cells(x, y, chars[::-1], fg_map[colors[::-1]], bg_index)
+        return n_encoded * codes.shape[1]
+
+    def _get_rows(self, width, height):
+        (key, codes, colors, chars, row_versions), n_encoded = self._update_cells(width, height)
+        c_height = len(codes)
+
+        # Reuse the previously rendered rows if they were rendered with the
+        # same size and padding, and only render the rows that have changed.
+        if self._rendered is not None and self._rendered[0] == key:
+            rows, rendered_versions = self._rendered[1:]
+            changed = np.flatnonzero(row_versions != rendered_versions)
+        else:
+            rows = [None] * c_height
+            changed = np.arange(c_height)
+
+        for y in changed:
+            rows[c_height - 1 - y] = self._get_row(codes[y], colors[y])
 
+        self._rendered = (key, rows, row_versions.copy())
+        return list(rows)
+
+    def _iter_rows(self, width, height):
+        padding = self.get_padding(width, height)
         c_width, c_height = self._get_cell_dimensions(width, height)
 
-        rows = []
-        for y in reversed(np.arange(c_height)):
-            row = self.background
-            for x in np.arange(c_width):
-                code = 0
-                for dot in (self._dots * self._get_cell_pattern(pattern, x, y)).flatten():
-                    code |= dot
-                if code == 0:
-                    row += ' '
-                else:
-                    color = self._get_cell_color(color_map, x, y)
-                    row += color
-                    row += unichr(code)
-                    row += fg.RESET
-            row += bg.RESET
-            rows.append(row)
-        return rows
+        # Cell rows are numbered from the bottom, so the first batch is the top.
+        for top in range(c_height, 0, -self._stream_rows):
+            batch = np.arange(top - 1, max(top - self._stream_rows, 0) - 1, -1)
+            codes, colors = self._get_cells(padding, c_width, batch)
+            for code_row, color_row in zip(codes, colors):
+                yield self._get_row(code_row, color_row)
+
+
+class PackedRasterCanvas(RasterCanvas):
+    """
+    A canvas of braille dots that stores one byte per character cell
+    instead of one bool per dot.
+
+    Each cell holds the or:ed braille bits of its dots, so dots are set by
+    or:ing the right bit into the cell and rendering is a direct lookup from
+    byte to character. Colors are also stored per cell, and the last color
+    set in a cell is used for the whole cell.
+    """
+
+    @property
+    def pattern(self):
+        """A copy of the dots of the canvas, unpacked to one bool per dot."""
+        bits = (self._dots - 0x2800).reshape(1, 4, 1, 2)
+        dots = (self._cells[:, None, :, None] & bits) != 0
+        dots = dots.reshape(self._c_height * 4, self._c_width * 2)
+        return dots[:self.height, :self.width]
+
+    @pattern.setter
+    def pattern(self, pattern):
+        self._cells = self._encode(pattern, self._c_width, self._c_height).astype(np.uint8)
+
+    def reset(self):
+        self._cells = np.zeros((self._c_height, self._c_width), dtype=np.uint8)
+        self._reset_colors()
+        self.invalidate()
+
+    def _reset_colors(self):
+        self._color_map = np.zeros((self._c_height, self._c_width), dtype=np.uint8)
+        self._palette = ['']
+        self._palette_indices = {'': 0}
+
+    def stretch(self, new_width, new_height):
+        padding = self.get_padding(new_width, new_height)
+        new_width = self.width + padding[1,:].sum()
+        new_height = self.height + padding[0,:].sum()
+        c_width, c_height = self._get_cell_dimensions(new_width, new_height)
+        cells, colors = self._get_cells(padding, c_width, np.arange(c_height))
+        self._cells = cells.astype(np.uint8)
+        self._color_map = colors.astype(self._color_map.dtype)
+        self._set_size(new_width, new_height)
+        self.invalidate()
+
+    def set(self, x, y, color=None, mode='raise'):
+        x, y = self._check_coordinates(x, y, mode)
+        color = self._get_color_index(color)
+        if self._use_workers(x):
+            # Rasterize into a temporary array of dots, and pack it once.
+            hits = parallel.rasterize(x, y, (self.height, self.width), self.workers)
+            cells = self._encode(hits, self._c_width, self._c_height).astype(np.uint8)
+            self._cells |= cells
+            self._color_map[cells > 0] = color
+            self._dirty_rows |= hits.any(axis=1)
+            self._modified()
+            return
+
+        cells = y // 4 * self._c_width + x // 2
+        bits = (self._dots - 0x2800)[y % 4, x % 2]
+        # Or the bits into the cells one bit value at a time. Repeated cells
+        # then always receive the same value, which makes the buffered fancy
+        # index assignment safe.
+        flat_cells = self._cells.reshape(-1)
+        for bit in np.unique(bits):
+            c = cells[bits == bit]
+            flat_cells[c] |= bit
+        self._color_map.reshape(-1)[cells] = color
+        self._dirty_rows[y] = True
+        self._modified()
+
+    def _get_cells(self, padding, c_width, rows):
+        if (padding[0, 0] % 4) or (padding[1, 0] % 2):
+            # The padding moves dots between cells, so the canvas has to be
+            # unpacked and encoded again. Every dot gets the color of its cell.
+            pattern = self.pattern
+            color_map = np.repeat(np.repeat(self._color_map, 4, axis=0), 2, axis=1)
+            color_map = color_map[:self.height, :self.width] * pattern
+            pattern = self._get_padded_rows(pattern, rows, padding[0, 0], padding[1])
+            color_map = self._get_padded_rows(color_map, rows, padding[0, 0], padding[1])
+            return (self._encode(pattern, c_width, len(rows)),
+                    self._get_cell_colors(color_map, c_width, len(rows)))
+
+        below = padding[0, 0] // 4
+        before = padding[1, 0] // 2
+        col_padding = (before, c_width - self._c_width - before)
+        return (self._get_padded_rows(self._cells, rows, below, col_padding, size=1),
+                self._get_padded_rows(self._color_map, rows, below, col_padding, size=1))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,248 @@
+"""
+A buffer of character cells that canvases are drawn into.
+"""
+from __future__ import unicode_literals
+
+import re
+
+import numpy as np
+
+from termplotlib.colors import CSI
+
+# Matches SGR escape sequences, i.e. colors and styles.
+_SGR = re.compile('\033\\[([0-9;]*)m')
+
+# The state of a cell without any colors or styles, as (styles, foreground, background).
+DEFAULT = ((), None, None)
+
+# Style parameters and the styles they turn off.
+_STYLE_OFF = {'22': ('1', '2'),
+              '23': ('3',),
+              '24': ('4',),
+              '27': ('7',)}
+
+# Styles that are visible on a space (underline, inverse, crossed out and overline).
+_SPACE_STYLES = set(['4', '7', '9', '53'])
+
+
+def update_state(state, params):
+    """Return the state after applying the parameters of an SGR sequence."""
+    styles, fore, back = state
+    params = params.split(';')
+    i = 0
+    while i < len(params):
+        p = params[i] or '0'
+        if p in ('38', '48'):
+            # Extended colors take either 1 (256 colors) or 3 (RGB) extra parameters.
+            n = 3 if params[i+1:i+2] == ['5'] else 5
+            if p == '38':
+                fore = ';'.join(params[i:i+n])
+            else:
+                back = ';'.join(params[i:i+n])
+            i += n
+            continue
+
+        code = int(p)
+        if code == 0:
+            styles, fore, back = DEFAULT
+        elif code == 39:
+            fore = None
+        elif code == 49:
+            back = None
+        elif 30 <= code <= 37 or 90 <= code <= 97:
+            fore = p
+        elif 40 <= code <= 47 or 100 <= code <= 107:
+            back = p
+        elif p in _STYLE_OFF:
+            styles = tuple(s for s in styles if s not in _STYLE_OFF[p])
+        elif p not in styles:
+            styles += (p,)
+        i += 1
+    return styles, fore, back
+
+
+def split_cells(row, state=DEFAULT):
+    """Split a rendered row into its character cells.
+
+    :param string row: A row as returned by get_rows of a canvas.
+    :param tuple state: The state at the start of the row.
+    :return: A list with a (state, char) tuple for every character in the row, where
+    state is the (styles, foreground, background) in effect for the character.
+    """
+    cells = []
+    pos = 0
+    for match in _SGR.finditer(row):
+        cells.extend((state, c) for c in row[pos:match.start()])
+        state = update_state(state, match.group(1))
+        pos = match.end()
+    cells.extend((state, c) for c in row[pos:])
+    return cells
+
+
+def change_state(old, new):
+    """Return an SGR sequence changing the state of the terminal from old to new."""
+    if new == DEFAULT:
+        return CSI + '0m'
+    if old[0] == new[0]:
+        params = []
+        if old[1] != new[1]:
+            params.append(new[1] or '39')
+        if old[2] != new[2]:
+            params.append(new[2] or '49')
+        return CSI + ';'.join(params) + 'm'
+    return CSI + ';'.join(['0'] + list(new[0]) + [p for p in new[1:] if p is not None]) + 'm'
+
+
+def serialize(chars, fg, bg, fg_palette, bg_palette, state=DEFAULT):
+    """Return the text of a run of cells, and the state of the terminal after it.
+
+    Consecutive cells with the same colors share one escape sequence. Spaces
+    look the same in any foreground color, so they keep the current one.
+
+    :param ndarray chars: The code points of the cells.
+    :param ndarray fg: The foreground indices of the cells.
+    :param ndarray bg: The background indices of the cells.
+    :param list fg_palette: The (styles, foreground) of every foreground index.
+    :param list bg_palette: The background of every background index.
+    :param tuple state: The state of the terminal before the first cell.
+    """
+    if len(chars) == 0:
+        return '', state
+    text = chars.astype('<u4').tobytes().decode('utf-32-le')
+    starts = np.flatnonzero(np.r_[True, (fg[1:] != fg[:-1]) | (bg[1:] != bg[:-1])])
+    ends = np.r_[starts[1:], len(chars)]
+
+    out = []
+    for start, end in zip(starts, ends):
+        styles, fore = fg_palette[fg[start]]
+        new = (styles, fore, bg_palette[bg[start]])
+        if new != state:
+            if (new[0] == state[0] and new[2] == state[2] and not _SPACE_STYLES.intersection(styles)
+                    and not text[start:end].strip(' ')):
+                # Only spaces with a new foreground color, which doesn't show.
+                pass
+            else:
+                out.append(change_state(state, new))
+                state = new
+        out.append(text[start:end])
+    return ''.join(out), state
+
+
+class Screen(object):
+    """
+    A buffer of character cells.
+
+    Every cell holds a code point and indices into palettes of foreground
+    (with styles) and background colors. Canvases write their cells into
+    the buffer, which is turned into text once when it is complete.
+    """
+
+    def __init__(self, c_width, c_height):
+        """Create an empty screen.
+
+        :param int c_width: The width in characters.
+        :param int c_height: The height in characters.
+        """
+        self.chars = np.full((c_height, c_width), ord(' '), dtype=np.uint32)
+        self.fg = np.zeros((c_height, c_width), dtype=np.uint16)
+        self.bg = np.zeros((c_height, c_width), dtype=np.uint16)
+        self.fg_palette = [DEFAULT[:2]]
+        self.bg_palette = [DEFAULT[2]]
+        self._fg_index = {DEFAULT[:2]: 0}
+        self._bg_index = {DEFAULT[2]: 0}
+
+    @property
+    def c_width(self):
+        return self.chars.shape[1]
+
+    @property
+    def c_height(self):
+        return self.chars.shape[0]
+
+    def get_fg_index(self, fg):
+        """Return the palette index of a (styles, foreground) tuple."""
+        if fg not in self._fg_index:
+            self._fg_index[fg] = len(self.fg_palette)
+            self.fg_palette.append(fg)
+        return self._fg_index[fg]
+
+    def get_bg_index(self, bg):
+        """Return the palette index of a background."""
+        if bg not in self._bg_index:
+            self._bg_index[bg] = len(self.bg_palette)
+            self.bg_palette.append(bg)
+        return self._bg_index[bg]
+
+    def get_state_indices(self, escape):
+        """Return the foreground and background index set by the SGR sequences in escape."""
+        state = DEFAULT
+        for match in _SGR.finditer(escape):
+            state = update_state(state, match.group(1))
+        return self.get_fg_index(state[:2]), self.get_bg_index(state[2])
+
+    def _clip(self, x, y, c_width, c_height):
+        """Return the part of a region that is inside the screen as slices."""
+        return (slice(y, min(y + c_height, self.c_height)),
+                slice(x, min(x + c_width, self.c_width)))
+
+    def write_cells(self, x, y, chars, fg, bg):
+        """Write arrays of cells with their top left corner at cell (x, y).
+
+        The arrays are cropped to the screen. fg and bg are indices into the
+        palettes of this screen, and bg can also be a single index.
+        """
+        rows, cols = self._clip(x, y, chars.shape[1], chars.shape[0])
+        h, w = rows.stop - rows.start, cols.stop - cols.start
+        self.chars[rows, cols] = chars[:h, :w]
+        self.fg[rows, cols] = fg[:h, :w]
+        self.bg[rows, cols] = bg if np.isscalar(bg) else bg[:h, :w]
+
+    def write_rows(self, rows, x, y):
+        """Write rendered rows of text with their top left corner at cell (x, y)."""
+        for i, row in enumerate(rows[:max(self.c_height - y, 0)]):
+            cells = split_cells(row)[:max(self.c_width - x, 0)]
+            for j, ((styles, fore, back), char) in enumerate(cells):
+                self.chars[y + i, x + j] = ord(char)
+                self.fg[y + i, x + j] = self.get_fg_index((styles, fore))
+                self.bg[y + i, x + j] = self.get_bg_index(back)
+
+    def blit(self, screen, x, y):
+        """Copy the cells of another screen to this one, with its top left corner at cell (x, y)."""
+        fg_map = np.array([self.get_fg_index(fg) for fg in screen.fg_palette], dtype=np.uint16)
+        bg_map = np.array([self.get_bg_index(bg) for bg in screen.bg_palette], dtype=np.uint16)
+        self.write_cells(x, y, screen.chars, fg_map[screen.fg], bg_map[screen.bg])
+
+    def iter_rows(self):
+        """Yield the screen as rows of text, each ending with all colors and styles reset.
+
+        Every row is turned into text when it is requested.
+        """
+        for chars, fg, bg in zip(self.chars, self.fg, self.bg):
+            text, state = serialize(chars, fg, bg, self.fg_palette, self.bg_palette)
+            if state != DEFAULT:
+                text += change_state(state, DEFAULT)
+            yield text
+
+    def get_rows(self, previous=None):
+        """Return the screen as rows of text, each ending with all colors and styles reset.
+
+        :param tuple previous: (optional) An earlier screen and the rows returned for it.
+        Rows whose cells are the same in both screens are reused instead of turned
+        into text again.
+        """
+        unchanged = None
+        if previous is not None:
+            old, old_rows = previous
+            if (old.chars.shape == self.chars.shape and old.fg_palette == self.fg_palette
+                    and old.bg_palette == self.bg_palette):
+                unchanged = ((old.chars == self.chars) & (old.fg == self.fg) & (old.bg == self.bg)).all(axis=1)
+        if unchanged is None or not unchanged.any():
+            return list(self.iter_rows())
+
+        rows = list(old_rows)
+        for i in np.flatnonzero(~unchanged):
+            text, state = serialize(self.chars[i], self.fg[i], self.bg[i], self.fg_palette, self.bg_palette)
+            if state != DEFAULT:
+                text += change_state(state, DEFAULT)
+            rows[i] = text
+        return rows
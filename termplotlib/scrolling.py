@@ -0,0 +1,80 @@
+"""
+Canvases for plotting streams of data.
+"""
+from __future__ import unicode_literals
+
+import numpy as np
+
+from termplotlib.raster import RasterCanvas
+
+class ScrollingCanvas(RasterCanvas):
+    """
+    A canvas of braille dots that scrolls to the left as new columns are
+    appended to the right.
+
+    The columns are stored in a circular buffer, so appending a column only
+    overwrites the oldest column instead of moving the whole pattern. Note
+    that pattern holds the columns in buffer order, and that x coordinates
+    given to set count from the oldest column.
+    """
+
+    # Buffer index of the oldest column.
+    _head = 0
+
+    def reset(self):
+        super(ScrollingCanvas, self).reset()
+        self._head = 0
+
+    def append(self, y, color=None, mode='raise'):
+        """Append new columns, dropping the same number of the oldest columns.
+
+        :param y: The y coordinate of the dot in each new column.
+        :param string color: (optional) The color of the new dots.
+        :param string mode: How to handle dots outside the canvas, see set.
+        """
+        y = np.atleast_1d(np.asarray(y, dtype=int))[-self.width:]
+        n = len(y)
+
+        columns = (self._head + np.arange(n)) % self.width
+        self.pattern[:, columns] = False
+        self._color_map[:, columns] = 0
+        self._head = (self._head + n) % self.width
+
+        # Every column has moved, so the whole canvas needs to be rendered again.
+        self._dirty_rows[:] = True
+        self.set(np.arange(self.width - n, self.width), y, color, mode)
+
+    def set(self, x, y, color=None, mode='raise'):
+        x, y = self._check_coordinates(x, y, mode)
+        super(ScrollingCanvas, self).set((x + self._head) % self.width, y, color)
+
+    def _get_columns(self):
+        """Return the buffer indices of the columns, from the oldest to the newest."""
+        return (self._head + np.arange(self.width)) % self.width
+
+    def stretch(self, new_width, new_height):
+        columns = self._get_columns()
+        self.pattern = self.pattern[:, columns]
+        self._color_map = self._color_map[:, columns]
+        self._head = 0
+        super(ScrollingCanvas, self).stretch(new_width, new_height)
+
+    def _get_cells(self, padding, c_width, rows):
+        columns = self._get_columns()
+        pattern = self._get_padded_rows(self.pattern, rows, padding[0, 0], padding[1], columns=columns)
+        color_map = self._get_padded_rows(self._color_map, rows, padding[0, 0], padding[1], columns=columns)
+        return (self._encode(pattern, c_width, len(rows)),
+                self._get_cell_colors(color_map, c_width, len(rows)))
+
+if __name__ == '__main__':
+    import sys
+    import time
+    from termplotlib.live import LiveRenderer
+
+    c = ScrollingCanvas(120, 40, background='navy')
+    renderer = LiveRenderer(c)
+    for i in range(500):
+        c.append(20 + 19 * np.sin(i / 10.0) * np.cos(i / 77.0), color='orange')
+        renderer.draw()
+        time.sleep(0.02)
+    print
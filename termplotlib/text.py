@@ -27,6 +27,7 @@ class TextCanvas(Canvas):
 
         self.width = max(map(len, self._lines)) * 2
         self.height = len(self._lines) * 4
+        self._modified()
 
     @property
     def color(self):
@@ -35,6 +36,7 @@ class TextCanvas(Canvas):
     @color.setter
     def color(self, color):
         self._fg = fg[color] if color else ''
+        self._modified()
 
     @property
     def background(self):
@@ -43,12 +45,14 @@ class TextCanvas(Canvas):
     @background.setter
     def background(self, background):
         self._bg = bg[background] if background else ''
+        self._modified()
 
     def _color_line(self, line):
+        if not (self._fg or self._bg):
+            return line
         return self._fg + self._bg + line + st.RESET_ALL
 
-    def get_rows(self, width=None, height=None):
-        width, height = self._check_dimensions(width, height)
+    def _iter_rows(self, width, height):
         padding = self.get_padding(width, height)
         pad_above = np.ceil(padding[0,0] / 4.0).astype(int)
         pad_below = np.floor(padding[0,1] / 4.0).astype(int)
@@ -58,15 +62,13 @@ class TextCanvas(Canvas):
         c_height = self._to_c_height(height)
         empty_lines = c_height - len(self._lines) - (pad_above + pad_below)
 
-        lines_out = []
-
-        lines_out.extend([self._color_line(' ' * c_width) for i in range(pad_above + empty_lines)])
+        for i in range(pad_above + empty_lines):
+            yield self._color_line(' ' * c_width)
         for line in self._lines:
             line_pad = c_width - (len(line) + pad_before + pad_after)
-            lines_out.append(self._color_line(' ' * pad_before + line + ' ' * (pad_after + line_pad)))
-        lines_out.extend([self._color_line(' ' * c_width) for i in range(pad_below)])
-
-        return lines_out
+            yield self._color_line(' ' * pad_before + line + ' ' * (pad_after + line_pad))
+        for i in range(pad_below):
+            yield self._color_line(' ' * c_width)
 
 class TextBox(TextCanvas):
 
@@ -112,6 +114,7 @@ class TextBox(TextCanvas):
 
         self.width = (max(map(len, self._lines)) + 2) * 2
         self.height = (len(self._lines) + 2) * 4
+        self._modified()
 
     @property
     def border_color(self):
@@ -120,6 +123,7 @@ class TextBox(TextCanvas):
     @border_color.setter
     def border_color(self, color):
         self._b_fg = fg[color] if color else self.color
+        self._modified()
 
     @property
     def border_style(self):
@@ -130,11 +134,11 @@ class TextBox(TextCanvas):
         if style in self._box_chars:
             self._b_st = style
             self._box = self._box_chars[style]
+            self._modified()
         else:
             raise ValueError('Invalid box style: {}'.format(style))
 
-    def get_rows(self, width=None, height=None):
-        width, height = self._check_dimensions(width, height)
+    def _iter_rows(self, width, height):
         padding = self.get_padding(width, height)
         pad_above = max(np.ceil(padding[0,0] / 4.0).astype(int), 0)
         pad_below = max(np.floor(padding[0,1] / 4.0).astype(int), 0)
@@ -144,28 +148,32 @@ class TextBox(TextCanvas):
         c_height = self._to_c_height(height)
         empty_lines = c_height - len(self._lines) - (pad_above + pad_below) - 2
 
-        lines_out = []
-        lines_out.append(self._b_fg + self._bg + self._box['ul'] +
-                         self._box['h'] * (c_width - 2) +
-                         self._box['ur'] + st.RESET_ALL)
+        # Only switch to the text color and back if it differs from the border color.
+        text_fg = self._fg if self._fg != self._b_fg else ''
+        border_fg = self._b_fg if text_fg else ''
+        reset = st.RESET_ALL if (self._b_fg or self._bg or text_fg) else ''
+
+        yield (self._b_fg + self._bg + self._box['ul'] +
+               self._box['h'] * (c_width - 2) +
+               self._box['ur'] + reset)
         pad_line = self._b_fg + self._bg + self._box['v'] + \
                    ' ' * (c_width - 2) + \
-                   self._box['v'] + st.RESET_ALL
-        lines_out.extend([pad_line] * (pad_above + empty_lines))
+                   self._box['v'] + reset
+        for i in range(pad_above + empty_lines):
+            yield pad_line
 
         for line in self._lines:
             line_pad = (c_width - 2) - (len(line) + pad_before + pad_after)
-            lines_out.append(self._b_fg + self._bg + self._box['v'] +
-                             self._fg + ' ' * pad_before +
-                             line +
-                             ' ' * (pad_after + line_pad) +
-                             self._b_fg + self._box['v'] + st.RESET_ALL)
-        lines_out.extend([pad_line] * pad_below)
-        lines_out.append(self._b_fg + self._bg + self._box['ll'] +
-                         self._box['h'] * (c_width - 2) +
-                         self._box['lr'] + st.RESET_ALL)
-
-        return lines_out
+            yield (self._b_fg + self._bg + self._box['v'] +
+                   text_fg + ' ' * pad_before +
+                   line +
+                   ' ' * (pad_after + line_pad) +
+                   border_fg + self._box['v'] + reset)
+        for i in range(pad_below):
+            yield pad_line
+        yield (self._b_fg + self._bg + self._box['ll'] +
+               self._box['h'] * (c_width - 2) +
+               self._box['lr'] + reset)
 
 if __name__ == '__main__':
 
@@ -0,0 +1,171 @@
+"""
+Tests comparing the fast paths of RasterCanvas to plain references.
+"""
+from __future__ import unicode_literals
+
+import re
+import unittest
+
+import numpy as np
+
+from termplotlib.colors import fg, TRUECOLOR, get_color_depth, set_color_depth
+from termplotlib.raster import RasterCanvas, PackedRasterCanvas
+
+_escape = re.compile('\x1b\\[[0-9;]*m')
+
+
+def reference_rows(canvas, width, height):
+    """Render the pattern of canvas one cell at a time, without colors."""
+    pattern = np.pad(canvas.pattern, canvas.get_padding(width, height), mode='constant')
+    rows = []
+    for y in reversed(range(int(np.ceil(height / 4.0)))):
+        row = ''
+        for x in range(int(np.ceil(width / 2.0))):
+            cell = pattern[y*4:(y+1)*4, x*2:(x+1)*2]
+            code = 0
+            for (i, j), dot in np.ndenumerate(cell):
+                if dot:
+                    code |= RasterCanvas._dots[i, j]
+            row += unichr(code) if code else ' '
+        rows.append(row)
+    return rows
+
+
+def reference_colors(canvas):
+    """Return the palette index of the most used color of every cell, one cell at a time."""
+    colors = np.zeros((canvas._c_height, canvas._c_width), dtype=int)
+    for y in range(canvas._c_height):
+        for x in range(canvas._c_width):
+            counts = {}
+            for color in canvas._color_map[y*4:(y+1)*4, x*2:(x+1)*2].ravel():
+                if color:
+                    counts[color] = counts.get(color, 0) + 1
+            if counts:
+                # On a tie the color first added to the palette wins.
+                colors[y, x] = max(sorted(counts), key=counts.get)
+    return colors
+
+
+def random_canvas(cls, rng, width, height, colors=(None,)):
+    canvas = cls(width, height)
+    n = rng.randint(0, width * height)
+    for color in colors:
+        canvas.set(rng.randint(0, width, n), rng.randint(0, height, n), color)
+    return canvas
+
+
+class EncodeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.RandomState(0)
+
+    def test_encode(self):
+        for i in range(50):
+            width, height = self.rng.randint(1, 40, 2)
+            canvas = random_canvas(RasterCanvas, self.rng, width, height)
+            c_width, c_height = canvas._get_cell_dimensions(width, height)
+            codes = canvas._encode(canvas.pattern, c_width, c_height)
+            # The reference rows are top row first, the codes bottom row first.
+            expected = [[ord(c) - 0x2800 if c != ' ' else 0 for c in row]
+                        for row in reference_rows(canvas, width, height)[::-1]]
+            np.testing.assert_array_equal(codes, expected)
+
+    def test_get_rows(self):
+        for i in range(50):
+            width, height = self.rng.randint(1, 40, 2)
+            canvas = random_canvas(RasterCanvas, self.rng, width, height)
+            self.assertEqual(canvas.get_rows(), reference_rows(canvas, width, height))
+
+    def test_get_rows_padded(self):
+        for i in range(20):
+            width, height = self.rng.randint(1, 40, 2)
+            canvas = random_canvas(RasterCanvas, self.rng, width, height)
+            new_width, new_height = width + self.rng.randint(0, 9), height + self.rng.randint(0, 9)
+            self.assertEqual(canvas.get_rows(new_width, new_height),
+                             reference_rows(canvas, new_width, new_height))
+
+    def test_get_rows_packed(self):
+        for i in range(50):
+            width, height = self.rng.randint(1, 40, 2)
+            canvas = random_canvas(PackedRasterCanvas, self.rng, width, height)
+            self.assertEqual(canvas.get_rows(), reference_rows(canvas, width, height))
+
+    def test_get_rows_after_set(self):
+        canvas = random_canvas(RasterCanvas, self.rng, 30, 20)
+        canvas.get_rows()
+        for i in range(10):
+            canvas.set(self.rng.randint(0, 30, 5), self.rng.randint(0, 20, 5))
+            self.assertEqual(canvas.get_rows(), reference_rows(canvas, 30, 20))
+
+
+class ColorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.RandomState(0)
+
+    def test_palette(self):
+        canvas = RasterCanvas(20, 12)
+        colors = ['red', 'blue', (0, 128, 255), None, 'red']
+        for i, color in enumerate(colors):
+            canvas.set([i], [i], color)
+        expected = [fg['red'], fg['blue'], fg.RGB(0, 128, 255), '', fg['red']]
+        self.assertEqual([canvas._palette[canvas._color_map[i, i]] for i in range(len(colors))], expected)
+        self.assertEqual(len(canvas._palette), 4)
+
+    def test_too_many_colors(self):
+        depth = get_color_depth()
+        set_color_depth(TRUECOLOR)
+        try:
+            canvas = RasterCanvas(4, 4)
+            colors = [(i >> 8, i & 0xff, 0) for i in range(65535)]
+            indices = [canvas._get_color_index(color) for color in colors]
+            self.assertEqual(indices, range(1, 65536))
+            self.assertEqual(canvas._color_map.dtype, np.uint16)
+            self.assertRaises(ValueError, canvas._get_color_index, (255, 255, 1))
+            self.assertEqual(canvas._get_color_index(colors[-1]), 65535)
+        finally:
+            set_color_depth(depth)
+
+    def test_cell_colors(self):
+        for i in range(50):
+            width, height = self.rng.randint(1, 40, 2)
+            canvas = random_canvas(RasterCanvas, self.rng, width, height, ['red', 'blue', (0, 128, 255), None])
+            colors = canvas._get_cell_colors(canvas._color_map, canvas._c_width, canvas._c_height)
+            np.testing.assert_array_equal(colors, reference_colors(canvas))
+
+    def test_get_rows_colored(self):
+        for i in range(20):
+            width, height = self.rng.randint(1, 40, 2)
+            canvas = random_canvas(RasterCanvas, self.rng, width, height, ['red', 'blue', (0, 128, 255)])
+            rows = [_escape.sub('', row) for row in canvas.get_rows()]
+            self.assertEqual(rows, reference_rows(canvas, width, height))
+
+
+class PlotPathTest(unittest.TestCase):
+
+    def test_decimate(self):
+        rng = np.random.RandomState(0)
+        for i in range(100):
+            width, height = rng.randint(1, 60, 2)
+            n = rng.randint(1, 2000)
+            if i % 2:
+                x = np.sort(rng.randint(0, width, n))
+            else:
+                x = rng.randint(0, width, n)
+            y = rng.randint(0, height, n)
+            full = RasterCanvas(width, height)
+            full.plot_path(x, y, decimate=False)
+            decimated = RasterCanvas(width, height)
+            decimated.plot_path(x, y, decimate=True)
+            np.testing.assert_array_equal(decimated.pattern, full.pattern)
+
+    def test_decimate_single_point(self):
+        full = RasterCanvas(10, 10)
+        full.plot_path([3], [4], decimate=False)
+        decimated = RasterCanvas(10, 10)
+        decimated.plot_path([3], [4])
+        np.testing.assert_array_equal(decimated.pattern, full.pattern)
+
+
+if __name__ == '__main__':
+    unittest.main()